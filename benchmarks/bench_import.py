@@ -0,0 +1,101 @@
+""" startup time of importing markerplot in a fresh interpreter, compared to importing its dependencies alone.
+
+    Each statement is timed in a new python process, so the module caches of previous runs don't hide
+    any import cost. The modules loaded by the import are checked for gui toolkits, which should only be
+    imported by the interactive window:
+
+        python benchmarks/bench_import.py
+        python benchmarks/bench_import.py --importtime
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+dir_ = Path(__file__).parent
+
+## statements timed in a fresh interpreter, the dependencies give the baseline for the markerplot import
+statements = dict(
+    numpy = 'import numpy',
+    matplotlib = 'import matplotlib',
+    matplotlib_figure = 'import matplotlib.figure',
+    markerplot = 'import markerplot',
+    markerplot_pyplot = 'import matplotlib; matplotlib.use("Agg"); import matplotlib.pyplot; import markerplot',
+)
+
+## modules that must not be loaded by a headless import of markerplot. PIL is not listed, matplotlib imports it.
+gui_modules = ('PySide2', 'PyQt5', 'PyQt6', 'PySide6', 'tkinter', 'win32clipboard',
+               'matplotlib.backends.backend_qt5agg', 'markerplot.interactive')
+
+timer = """
+import sys, time
+t0 = time.perf_counter()
+{stmt}
+t1 = time.perf_counter()
+print(t1 - t0)
+print(' '.join(m for m in {gui!r} if m in sys.modules))
+"""
+
+def time_import(stmt, repeat):
+    """ returns the import times in seconds of each run, and the gui modules that were loaded by the statement
+    """
+    times, loaded = [], set()
+    for i in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', timer.format(stmt=stmt, gui=gui_modules)],
+                                      cwd=dir_.parent, text=True)
+        t, mods = (out.splitlines() + [''])[:2]
+        times.append(float(t))
+        loaded.update(mods.split())
+    return np.array(times), sorted(loaded)
+
+def importtime(stmt, top=15):
+    """ prints the modules with the largest cumulative import time, from python -X importtime
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', stmt], cwd=dir_.parent, text=True,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), int(self_us), name.rstrip()))
+
+    print('\n{:>12}{:>12}  {}'.format('cumulative', 'self', 'module (ms)'))
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print('{:>12.1f}{:>12.1f}  {}'.format(cumulative/1e3, self_us/1e3, name))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='markerplot import time benchmark')
+    parser.add_argument('--repeat', type=int, default=10, help='number of fresh interpreters per statement')
+    parser.add_argument('--importtime', action='store_true', help='print the slowest modules of the markerplot import')
+    parser.add_argument('--save', default=None, help='save the results as json to this file')
+    args = parser.parse_args(argv)
+
+    results = []
+    failed = False
+    for name, stmt in statements.items():
+        times, loaded = time_import(stmt, args.repeat)
+        r = dict(bench=name, best=float(np.min(times)), median=float(np.median(times)), gui_modules=loaded)
+        results.append(r)
+
+        flag = ''
+        if loaded and name.startswith('markerplot'):
+            flag = '  <-- loaded {}'.format(', '.join(loaded))
+            failed = True
+        print('{:<20} best={:8.1f} ms  median={:8.1f} ms{}'.format(name, r['best']*1e3, r['median']*1e3, flag))
+
+    if args.importtime:
+        importtime(statements['markerplot'])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(dict(python=sys.version, results=results), f, indent=1)
+        print('\nsaved {}'.format(args.save))
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
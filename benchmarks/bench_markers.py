@@ -0,0 +1,186 @@
+""" micro-benchmarks for the marker hot paths, rendered headless on the Agg backend.
+
+    Each benchmark is run for every combination of points per line, lines per axes, markers per axes and
+    linked axes count. Results are saved as json in benchmarks/results/<label>.json, and can be compared
+    against a previous run to find regressions between versions:
+
+        python benchmarks/bench_markers.py --label before
+        python benchmarks/bench_markers.py --label after --compare benchmarks/results/before.json
+"""
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+dir_ = Path(__file__).parent
+sys.path.insert(0, str(dir_.parent))
+
+import markerplot
+
+## benchmarks slower than this ratio of the compared run are reported as regressions
+regression_ratio = 1.2
+
+def make_figure(points, lines, markers, linked):
+    """ returns a figure with 1 + linked axes, each with lines*points data points and markers evenly spaced along x.
+        All axes are linked, and the figure is drawn once so the blitting backgrounds exist.
+    """
+    fig, axes = plt.subplots(1 + linked, 1, squeeze=False, figsize=(10, 3 + 2*linked))
+    axes = list(axes[:,0])
+
+    x = np.linspace(0, 100, points)
+    rng = np.random.default_rng(0)
+    for ax in axes:
+        for i in range(lines):
+            ax.plot(x, np.sin(x*(i+1)/10) + rng.normal(0, 0.1, points), label='line{}'.format(i))
+
+    fig.marker_enable(interactive=True, link_all=linked > 0)
+    fig.canvas.draw()
+
+    xd = np.linspace(5, 95, markers)
+    for ax in axes:
+        ax.marker_add(xd=xd)
+
+    return fig, axes
+
+def benchmarks(fig, axes):
+    """ returns a dict of benchmark name: function, each function runs one call of the benchmarked path
+    """
+    ax = axes[0]
+    mgr = fig._eventmanager
+    marker = ax.marker_active
+    rng = np.random.default_rng(1)
+
+    xq = rng.uniform(0, 100, 64)
+    y0 = (ax.bbox.y0 + ax.bbox.y1)/2
+    dq = rng.uniform(ax.bbox.x0, ax.bbox.x1, 64)
+    state = dict(i=0, shift=1)
+
+    def next_i():
+        state['i'] = (state['i'] + 1) % len(xq)
+        return state['i']
+
+    def shift():
+        ## alternate directions so the marker stays near its starting point
+        state['shift'] = -state['shift']
+        marker.shift(state['shift'])
+
+    def draw_lines_markers_stale():
+        ax.lines[0].stale = True
+        ax.draw_lines_markers()
+
+    return dict(
+        find_nearest_xdpoint = lambda: marker.find_nearest_xdpoint(xd=xq[next_i()]),
+        find_nearest_xdpoint_disp = lambda: marker.find_nearest_xdpoint(disp=(dq[next_i()], y0)),
+        move_to_point = lambda: marker.move_to_point(xd=xq[next_i()]),
+        move_linked = lambda: mgr.move_linked(ax, dq[next_i()], y0),
+        space_labels = marker.space_labels,
+        shift = shift,
+        draw_lines_markers = ax.draw_lines_markers,
+        draw_lines_markers_stale = draw_lines_markers_stale,
+        update_background = mgr.update_background,
+    )
+
+def run(grid, repeat, min_time, select=None):
+    """ runs all benchmarks for each parameter combination in grid.
+        Returns a list of dicts with the parameters and the best and median time per call in seconds.
+    """
+    results = []
+    for points, lines, markers, linked in itertools.product(*grid):
+        fig, axes = make_figure(points, lines, markers, linked)
+
+        for name, func in benchmarks(fig, axes).items():
+            if select and name not in select:
+                continue
+            timer = timeit.Timer(func)
+            if min_time == None:
+                number, _ = timer.autorange()
+            else:
+                number = max(int(min_time / max(timer.timeit(1), 1e-9)), 1)
+            times = np.array(timer.repeat(repeat, number)) / number
+
+            r = dict(bench=name, points=points, lines=lines, markers=markers, linked=linked,
+                     best=float(np.min(times)), median=float(np.median(times)), number=number)
+            results.append(r)
+            print('{bench:<26} points={points:<8} lines={lines:<3} markers={markers:<3} linked={linked:<2} '
+                  '{best:.3e} s'.format(**r))
+
+        plt.close(fig)
+    return results
+
+def metadata(label):
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=dir_, text=True,
+                                         stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return dict(label=label, commit=commit, date=datetime.now().isoformat(timespec='seconds'),
+                python=platform.python_version(), numpy=np.__version__, matplotlib=matplotlib.__version__,
+                machine=platform.machine(), processor=platform.processor(), system=platform.system())
+
+def key(r):
+    return (r['bench'], r['points'], r['lines'], r['markers'], r['linked'])
+
+def compare(results, fname):
+    """ prints the time ratio of each benchmark to the matching benchmark in a previous results file
+    """
+    with open(fname) as f:
+        old = {key(r): r for r in json.load(f)['results']}
+
+    print('\ncompared to {}:'.format(fname))
+    regressions = 0
+    for r in results:
+        if key(r) not in old:
+            continue
+        ratio = r['best'] / old[key(r)]['best']
+        flag = ''
+        if ratio > regression_ratio:
+            flag = ' <-- slower'
+            regressions += 1
+        print('{bench:<26} points={points:<8} lines={lines:<3} markers={markers:<3} linked={linked:<2} '.format(**r)
+              + '{:6.2f}x{}'.format(ratio, flag))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='markerplot micro-benchmarks')
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 100000], help='points per line')
+    parser.add_argument('--lines', type=int, nargs='+', default=[1, 8], help='lines per axes')
+    parser.add_argument('--markers', type=int, nargs='+', default=[1, 10], help='markers per axes')
+    parser.add_argument('--linked', type=int, nargs='+', default=[0, 2], help='number of linked axes')
+    parser.add_argument('--bench', nargs='+', default=None, help='only run these benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timing repeats')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='approximate time for each repeat in seconds, if 0 timeit.autorange is used')
+    parser.add_argument('--label', default=None, help='name of the results file, defaults to the git commit')
+    parser.add_argument('--compare', default=None, help='results file to compare against')
+    args = parser.parse_args(argv)
+
+    meta = metadata(args.label)
+    label = args.label or meta['commit'] or 'results'
+
+    grid = (args.points, args.lines, args.markers, args.linked)
+    results = run(grid, args.repeat, args.min_time or None, args.bench)
+
+    out = dir_ / 'results' / '{}.json'.format(label)
+    out.parent.mkdir(exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(dict(meta=meta, results=results), f, indent=1)
+    print('\nsaved {}'.format(out))
+
+    if args.compare:
+        return 1 if compare(results, args.compare) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,20 @@
 from . import patches
 from . patches import marker_default_params
-from . interactive import interactive_subplots
\ No newline at end of file
+
+## the gui pieces need PySide2 and the Qt backend, they are only imported on first use so headless users
+## of the markers don't pay for them
+_lazy = {
+    'interactive_subplots': 'interactive',
+}
+
+def __getattr__(name):
+    if name in _lazy:
+        import importlib
+        module = importlib.import_module('.' + _lazy[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy))
@@ -0,0 +1,123 @@
+import matplotlib
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from time import perf_counter
+from . import patches
+
+def render_job(data, markers=None, fname=None, figure_kw=None, marker_params=None, savefig_kw=None):
+    """ renders a single figure with non-interactive markers on the Agg canvas and saves it to fname.
+
+        Parameters
+        ----------
+            data: (list) lines to plot on the figure axes. Each line is either a tuple (x, y) or a dict with keys
+                  'x' and 'y', all other keys are passed to axes.plot (i.e. label, color, marker_xd)
+            markers: (list, dict) marker x-values passed to axes.marker_add(xd=markers), or a dict of keyword
+                     arguments for axes.marker_add (i.e. dict(idx=[10, 20]))
+            fname: (str, Path) output file, format is taken from the file extension
+            figure_kw: (dict) keyword arguments for the Figure (i.e. figsize, dpi, layout)
+            marker_params: (dict) marker parameters passed to fig.marker_enable
+            savefig_kw: (dict) keyword arguments for fig.savefig
+
+        Returns
+        -------
+            dict with the output file name, the process id, and the time in seconds spent on each stage of the job
+            (plot, markers, save and total). 'error' is None if the job succeeded, or the error message otherwise.
+    """
+    t0 = perf_counter()
+    result = dict(fname=fname, pid=multiprocessing.current_process().pid, error=None,
+                  plot=0.0, markers=0.0, save=0.0, total=0.0)
+    try:
+        fig = Figure(**(figure_kw or {}))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+
+        for line in data:
+            if isinstance(line, dict):
+                kw = dict(line)
+                ax.plot(kw.pop('x'), kw.pop('y'), **kw)
+            else:
+                ax.plot(*line)
+        t1 = perf_counter()
+
+        fig.marker_enable(interactive=False, **(marker_params or {}))
+        fig.canvas.mpl_connect('draw_event', _draw_markers)
+
+        if isinstance(markers, dict):
+            ax.marker_add(**markers)
+        elif markers is not None and len(markers):
+            ax.marker_add(xd=markers)
+        t2 = perf_counter()
+
+        fig.savefig(fname, **(savefig_kw or {}))
+        t3 = perf_counter()
+        result.update(plot=t1 - t0, markers=t2 - t1, save=t3 - t2)
+
+    except Exception as e:
+        result['error'] = '{}: {}'.format(type(e).__name__, e)
+
+    result['total'] = perf_counter() - t0
+    return result
+
+def _draw_markers(event):
+    ## markers are hidden artists that are only drawn on request. The labels are laid out at draw time so they
+    ## are placed with the final axes positions and savefig dpi.
+    for ax in event.canvas.figure.axes:
+        for m in getattr(ax, 'markers', []):
+            m.update_marker(renderer=event.renderer)
+            m.draw(event.renderer)
+
+def _init_worker():
+    ## workers never open windows, and importing a gui backend is slow
+    matplotlib.use('Agg', force=True)
+
+def _render_job(args):
+    job, kw = args
+    if isinstance(job, dict):
+        return render_job(**dict(kw, **job))
+    return render_job(*job, **kw)
+
+def render_batch(jobs, processes=None, chunksize=None, **kwargs):
+    """ renders a list of marker figures across a process pool. Worker processes are started with the 'spawn'
+        method and only use the Agg backend, so scripts calling this function need an if __name__ == '__main__' guard.
+
+        Parameters
+        ----------
+            jobs: (list) each job is a tuple (data, markers, fname), or a dict of render_job arguments.
+                  See render_job for the format of data and markers.
+            processes: (int) number of worker processes, defaults to the number of cpus.
+                       If 1, jobs are rendered in the calling process.
+            chunksize: (int) number of jobs sent to a worker at once, defaults to splitting the jobs into
+                       4 chunks per worker
+            kwargs: default render_job arguments for all jobs (figure_kw, marker_params, savefig_kw)
+
+        Returns
+        -------
+            list of render_job results, in the same order as jobs
+    """
+    jobs = [(job, kwargs) for job in jobs]
+    if processes == None:
+        processes = multiprocessing.cpu_count()
+
+    if processes <= 1 or len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+
+    processes = min(processes, len(jobs))
+    if chunksize == None:
+        chunksize = max(len(jobs) // (4*processes), 1)
+
+    ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(processes, mp_context=ctx, initializer=_init_worker) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=chunksize))
+
+def timing_summary(results):
+    """ returns the number of failed jobs and the mean, max and total time of each stage in a list of render_job results
+    """
+    summary = dict(jobs=len(results), errors=sum([r['error'] != None for r in results]))
+    for stage in ('plot', 'markers', 'save', 'total'):
+        t = np.array([r[stage] for r in results], dtype=float)
+        summary[stage] = dict(mean=float(np.mean(t)) if len(t) else 0.0, max=float(np.max(t)) if len(t) else 0.0,
+                              sum=float(np.sum(t)))
+    return summary
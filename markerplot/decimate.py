@@ -0,0 +1,87 @@
+import numpy as np
+from matplotlib.lines import Line2D
+from . markers import line_version
+
+def minmax_decimate(x, y, xmin, xmax, width):
+    """ reduces a line with ascending x-data to at most 4 points per pixel column (first, min, max and last point of
+        each column). The result is a visual approximation of the full line: it keeps the min/max envelope of each
+        column and the points where the line enters and leaves it, but antialiasing and line joins inside a column 
+        can differ from the full line.
+
+        Parameters
+        ----------
+            x: (np.ndarray) ascending x-data, in scaled (i.e. log10) coordinates if the axis is not linear
+            y: (np.ndarray) y-data
+            xmin, xmax: (float) visible x range, in the same coordinates as x
+            width: (int) number of pixel columns in the visible x range
+
+        Returns
+        -------
+            index array of the points in x and y that make up the decimated line
+    """
+    ## include one sample outside each side of the visible range so the line runs to the axes edges
+    i0 = max(np.searchsorted(x, xmin) - 1, 0)
+    i1 = min(np.searchsorted(x, xmax, side='right') + 1, len(x))
+
+    xs, ys = x[i0:i1], y[i0:i1]
+    if len(xs) <= 4*width:
+        return np.arange(i0, i1)
+
+    col = np.clip(np.floor((xs - xmin) * (width/(xmax - xmin))), -1, width).astype(np.intp)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(col)) + 1))
+    ends = np.append(starts[1:], len(xs)) - 1
+
+    ## index of the first min and max point in each column, nan values are ignored
+    imin = _arg_reduceat(np.fmin, ys, starts, ends)
+    imax = _arg_reduceat(np.fmax, ys, starts, ends)
+
+    idx = np.sort(np.concatenate((starts, imin, imax, ends)))
+    idx = idx[np.concatenate(([True], np.diff(idx) > 0))]
+    return idx + i0
+
+def _arg_reduceat(func, y, starts, ends):
+    """ returns the index of the first point in each segment of y that equals func.reduceat(y, starts)
+    """
+    vals = func.reduceat(y, starts)
+    hit = np.flatnonzero(y == np.repeat(vals, ends - starts + 1))
+    if len(hit) < 1:
+        return starts
+
+    pos = np.searchsorted(hit, starts)
+    idx = hit[np.minimum(pos, len(hit)-1)]
+    ## segments with only nan values don't have a hit
+    return np.where((pos < len(hit)) & (idx <= ends), idx, starts)
+
+def decimated_line(ax, l):
+    """ returns a copy of line l with min/max decimated data for the current axes limits and size. The copy is cached
+        on the line and recomputed only when the axes limits, axes width or line version change.
+        Returns l itself if the line can't be decimated (polar axes, or x-data that isn't ascending).
+    """
+    if ax.name == 'polar':
+        return l
+
+    version = line_version(l)
+    width = max(int(ax.bbox.width), 1)
+    key = (tuple(ax.viewLim.intervalx), width)
+
+    cache = getattr(l, '_marker_lod', None)
+    if cache != None and cache[0] == version and cache[1] == key:
+        proxy = cache[2]
+    else:
+        xydata = l.get_xydata()
+        x, y = xydata[:,0], xydata[:,1]
+        if len(x) < 2 or not np.all(np.diff(x) >= 0):
+            proxy = l
+        else:
+            ## bin in scaled coordinates so log axes get one bin per pixel column
+            scale = ax.xaxis.get_transform()
+            xmin, xmax = scale.transform(np.sort(ax.viewLim.intervalx))
+            idx = minmax_decimate(scale.transform(x), y, xmin, xmax, width)
+
+            proxy = Line2D(x[idx], y[idx])
+        l._marker_lod = (version, key, proxy)
+
+    if proxy is not l:
+        proxy.update_from(l)
+        proxy.set_visible(l.get_visible())
+    return proxy
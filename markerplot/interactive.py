@@ -16,19 +16,18 @@ import io
 
 import markerplot
 from markerplot import marker_default_params
+from markerplot.pyramid import line_yrange
 
 import sys
 import time
 from pathlib import Path
-import win32clipboard
-from PIL import Image
 
 import numpy as np
 from matplotlib.backends.qt_compat import is_pyqt5
 
-from matplotlib.backends.backend_qt5agg import (FigureCanvas, NavigationToolbar2QT as NavigationToolbar)
-
-from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib import mathtext
+from matplotlib.font_manager import FontProperties
 import matplotlib.pyplot as plt
 
 dir_ = Path(__file__).parent
@@ -70,9 +69,12 @@ class PlotWindow(QtWidgets.QMainWindow):
         marker_kw['interactive'] = kwargs.pop('interactive', True)
         marker_kw['top_axes'] = kwargs.pop('top_axes', None)
         marker_kw['link_all'] = kwargs.pop('link_all', False)
+        marker_kw['max_fps'] = kwargs.pop('max_fps', None)
     
 
         self.autoscale = kwargs.pop('autoscale', False)
+        ## axes that rescale their y-limits when the x-limits change
+        self._autoscale_axes = set()
 
 
         self.single_trace = kwargs.pop('single_trace', False)
@@ -153,49 +155,20 @@ class PlotWindow(QtWidgets.QMainWindow):
         self.toolbar.addSeparator()
         
             
-    def createCheckBoxLabel(self, label, size=14):
-        r,g,b,a=self.palette().base().color().getRgbF()
-
-        _figure=Figure(edgecolor=(r,g,b), facecolor=(r,g,b), dpi=100)
-
-        _canvas=FigureCanvas(_figure)
-
-        _figure.clear()
-        text=_figure.suptitle(
-            label,
-            x=0.0,
-            y=1.0,
-            horizontalalignment='left',
-            verticalalignment='top',
-            size='small'
-        )
-        _canvas.draw()
-
-        (x0,y0),(x1,y1)=text.get_window_extent().get_points()
-        w=x1-x0; h=y1-y0
-        
-        _canvas.setFixedSize(w,h)
-        return _canvas
-
     def createTracesGroup(self):
-        self.traces = [(None, None)]*(self.nrows * self.ncols)
+        self.traces = [None]*(self.nrows * self.ncols)
         for i in range(self.nrows):
             for j in range(self.ncols):
-                layout = QGridLayout()
-                layout.setAlignment(Qt.AlignLeft)
-                 
-                self.traces[i*self.ncols + j] = (QGroupBox("Axes {},{}".format(i,j)), layout)
-                self.traces[i*self.ncols + j][0].setLayout(layout) 
+                panel = TracePanel("Axes {},{}".format(i,j))
+                panel.model.visibility_changed.connect(self.traces_changed)
+                self.traces[i*self.ncols + j] = panel
 
     def update_traces_group(self, remove=True):
 
-        self.traces_cb = [[] for i in range(self.nrows * self.ncols)]
-
         self.draw_updates = False
         
         for i, ax in enumerate(self.ax.flatten()):
-            row = 1
-            layout = self.traces[i][1]
+            traces = []
             for ax_shared in ax.get_shared_x_axes().get_siblings(ax):
                 for l in ax_shared.lines:
 
@@ -203,67 +176,49 @@ class PlotWindow(QtWidgets.QMainWindow):
                     if label == '' or label[0] == '_':
                         continue
 
-                    cb = CheckBox('')#QCheckBox('')
-                    self.traces_cb[i].append((cb, l, label))
-
-                    y = l.get_ydata()
-                    y = np.where(np.isinf(y), np.nan, y)
-                    l.ymin, l.ymax  = np.nanmin(y), np.nanmax(y)
-                    
-                    cb.setChecked(True)
+                    traces.append((ax_shared, l, label))
 
-                    cb.stateChanged.connect(self.state_changed(ax_shared, l, cb, label))
-                    if self.single_trace:
-                        cb.setChecked(row==0)
-
-                    qlabel = self.createCheckBoxLabel(label, size=14)
-                    
-                    
-                    layout.addWidget(cb, row, 0)
-                    layout.addWidget(qlabel, row, 1, alignment=Qt.AlignLeft)
-                    
-                    row += 1
+                if self.autoscale and ax_shared not in self._autoscale_axes:
+                    ax_shared.callbacks.connect('xlim_changed', self.scale_ylim_visible)
+                    self._autoscale_axes.add(ax_shared)
 
                 leg_loc = ax_shared.get_legend()._loc_real if ax_shared.get_legend() != None else 0
                 ax_shared.legend(fontsize='small', loc=leg_loc)
+
+            panel = self.traces[i]
+            panel.set_traces(traces)
+            if self.single_trace:
+                panel.model.set_visible(range(1, len(traces)), False)
         self.draw_updates = True
 
         added_traces = False
-        self.cb_all = {}
-        for i, (tr, ly) in enumerate(self.traces):
-            #print(i, self.traces_cb[i])
-            if len(self.traces_cb[i]) > 1:
-                cb = CheckBox('')
-
-                layout = self.traces[i][1]
-                layout.addWidget(cb, 0, 0)
-
-                ax = self.ax.flatten()[i]
-                cb.stateChanged.connect(self.state_changed(ax, None, cb, None))
-                self.cb_all[id(ax._top_axes)] = cb
-
-            if len(self.traces_cb[i]) > 0:
-                #print('add')
+        for i, panel in enumerate(self.traces):
+            if len(panel.model.traces) > 0:
                 added_traces = True
-                self.layout.addWidget(tr, i, 1)
+                self.layout.addWidget(panel, i, 1)
+            elif panel.parent() != None:
+                self.layout.removeWidget(panel)
+                panel.setParent(None)
         
         if added_traces:
-            self.layout.addWidget(QGroupBox(), i+1,1)
             self.layout.setColumnStretch(0, 1)
-            self.layout.setRowStretch(i+1, 1)
-
 
     def scale_ylim_visible(self, axes):
+        """ sets the y-limits of axes to the y-range of the visible traces inside the current x-limits.
+            Called on every x-limit change (zoom and pan), the range of each line is taken from its min/max pyramid.
+        """
         if not self.autoscale:
             return
 
+        xmin, xmax = sorted(axes.get_xlim())
         miny, maxy = np.inf, -np.inf
         for l in axes.lines:
             if not l.get_visible() or l.get_label() == '' or l.get_label()[0] == '_':
                 continue
-            
-            miny = l.ymin if l.ymin < miny else miny
-            maxy = l.ymax if l.ymax > maxy else maxy
+
+            ymin, ymax = line_yrange(l, xmin, xmax)
+            miny = ymin if ymin < miny else miny
+            maxy = ymax if ymax > maxy else maxy
 
         if np.all(np.isfinite([miny, maxy])):
             pad = (maxy - miny)/20
@@ -271,64 +226,28 @@ class PlotWindow(QtWidgets.QMainWindow):
             min_y = miny - pad
             axes.set_ylim([min_y, max_y])
 
-    def update_all_cb(self, ax):
-        idx = list(self.ax.flatten()).index(ax._top_axes)
-        ax_cb = self.traces_cb[idx]
-        checks = np.zeros(len(ax_cb))
-        for i, cb in enumerate(ax_cb):
-            checks[i] = int(cb[0].isChecked())
-
-        self.draw_updates = False
-        if np.all(checks):
-            self.cb_all[id(ax._top_axes)].setCheckState(Qt.CheckState.Checked)
-        elif np.any(checks):
-            self.cb_all[id(ax._top_axes)].setCheckState(Qt.CheckState.PartiallyChecked)
-        else:
-            self.cb_all[id(ax._top_axes)].setCheckState(Qt.CheckState.Unchecked)
-        self.draw_updates = True
-                
-    def state_changed(self, ax, l, cb, label):
-
-        def calluser():
-            leg_loc = ax.get_legend()._loc_real if ax.get_legend() != None else 0
-            state = cb.isChecked()
-            state = cb.checkState()
-            
-            if l == None:
-                idx = list(self.ax.flatten()).index(ax)
-                ax_cb = self.traces_cb[idx]
-                if self.draw_updates:
-                    self.draw_updates = False
-                    if state == Qt.CheckState.PartiallyChecked:
-                        cb.setCheckState(Qt.CheckState.Checked)
-                    
-                    for i, (cbn, ln, labeln) in enumerate(ax_cb):
-                        
-                        cbn.setChecked(state)
-
-                    self.draw_updates = True
+    def traces_changed(self, axes):
+        """ redraws the axes after traces were shown or hidden in the trace panel
 
+            Parameters
+            ----------
+                axes: (list) axes of the changed traces
+        """
+        if not self.draw_updates:
+            return
 
-            else:
-                if self.draw_updates:
-                    self.update_all_cb(ax)
-                l.set_visible(state)
-                if state:
-                    l.set_label(label)
+        for ax in axes:
+            if self.autoscale:
+                leg_loc = ax.get_legend()._loc_real if ax.get_legend() != None else 0
+                self.scale_ylim_visible(ax)
+                ax.legend(fontsize='small', loc=leg_loc)
+                if hasattr(self.fig, '_eventmanager'):
+                    ## only the axes of this trace needs a new background
+                    self.fig._eventmanager.draw_axes(ax)
                 else:
-                    l.set_label('')
-
-
-            if self.draw_updates:
-                if self.autoscale:
-                    self.scale_ylim_visible(ax)
-                    ax.legend(fontsize='small', loc=leg_loc)
                     self.fig.canvas.draw()
-                else:
-                    ax._top_axes.draw_lines_markers()
-        
-
-        return calluser
+            else:
+                ax._top_axes.draw_lines_markers()
 
     def remove_all(self):
         for ax in self.fig._top_axes:
@@ -343,22 +262,41 @@ class PlotWindow(QtWidgets.QMainWindow):
         self.canvas.draw()
 
     def copy_figure(self):
+        """ copies the figure to the clipboard as an image, as currently shown on the canvas. The pixels are taken
+            from the Agg renderer buffer, so the figure is not rendered or encoded again.
+        """
+        if getattr(self.canvas, 'renderer', None) == None:
+            self.canvas.draw()
+
+        buf = self.canvas.buffer_rgba()
+        h, w = buf.shape[:2]
+        ## the QImage only wraps the renderer buffer, copy it once so the clipboard data survives the next redraw
+        image = QtGui.QImage(buf, w, h, buf.strides[0], QtGui.QImage.Format_RGBA8888).copy()
+        image.setDevicePixelRatio(self.canvas._dpi_ratio)
+
+        QApplication.clipboard().setImage(image)
+
+    def copy_figure_format(self, fmt='svg', **kwargs):
+        """ copies the figure to the clipboard as png or svg file data, for pasting into applications that
+            accept vector or lossless images.
+
+            Parameters
+            ----------
+                fmt: (str) 'svg' or 'png'
+                kwargs: keyword arguments for fig.savefig (i.e. dpi, transparent)
+        """
+        mime_types = dict(svg='image/svg+xml', png='image/png')
+        if fmt not in mime_types:
+            raise ValueError('Unsupported clipboard format: {}'.format(fmt))
 
         buf = io.BytesIO()
-        self.fig.savefig(buf)
-
-        image = Image.open(buf)
-        output = io.BytesIO()
-        image.convert("RGB").save(output, "BMP")
-        data = output.getvalue()[14:]
-        output.close()
-
-        win32clipboard.OpenClipboard()
-        win32clipboard.EmptyClipboard()
-        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, data)
-        win32clipboard.CloseClipboard()
+        self.fig.savefig(buf, format=fmt, **kwargs)
+
+        data = QtCore.QMimeData()
+        data.setData(mime_types[fmt], QtCore.QByteArray(buf.getvalue()))
         buf.close()
-        
+
+        QApplication.clipboard().setMimeData(data)
 
     def _show(self):
         self.update_traces_group(remove=False)
@@ -377,6 +315,216 @@ class CheckBox(QCheckBox):
         super(CheckBox, self).keyPressEvent(event)
 
 
+class TraceModel(QtCore.QAbstractListModel):
+
+    ## list of axes with traces that were shown or hidden
+    visibility_changed = QtCore.Signal(object)
+
+    def __init__(self, parent=None):
+        """ list model of the labeled lines of an axes and its shared axes. The check state of each row is the
+            visibility of the line, hidden lines have their label removed so they are left out of the legend.
+        """
+        super().__init__(parent)
+        ## list of (axes, line, label)
+        self.traces = []
+
+    def set_traces(self, traces):
+        self.beginResetModel()
+        self.traces = list(traces)
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.traces)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        ax, l, label = self.traces[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return label
+        elif role == Qt.CheckStateRole:
+            return Qt.Checked if l.get_visible() else Qt.Unchecked
+        elif role == Qt.DecorationRole:
+            return QtGui.QColor(matplotlib.colors.to_hex(l.get_color()))
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        self.set_visible([index.row()], Qt.CheckState(value) == Qt.Checked)
+        return True
+
+    def set_visible(self, rows, state):
+        """ shows or hides the traces in rows, and emits visibility_changed once for all changed traces
+        """
+        changed = []
+        axes = []
+        for row in rows:
+            ax, l, label = self.traces[row]
+            if l.get_visible() == state:
+                continue
+
+            l.set_visible(state)
+            l.set_label(label if state else '')
+            changed.append(row)
+            if ax not in axes:
+                axes.append(ax)
+
+        if len(changed):
+            self.dataChanged.emit(self.index(min(changed)), self.index(max(changed)), [Qt.CheckStateRole])
+            self.visibility_changed.emit(axes)
+
+
+def mathtext_pixmap(text, size, color, ratio=1.0):
+    """ returns a QPixmap of text rendered with matplotlib mathtext, or None if text isn't valid mathtext
+
+        Parameters
+        ----------
+            text: (str) text with math expressions between '$' signs
+            size: (int) font size in pixels
+            color: (str) text color
+            ratio: (float) device pixel ratio of the widget the pixmap is drawn on
+    """
+    buf = io.BytesIO()
+    try:
+        mathtext.math_to_image(text, buf, prop=FontProperties(size=size), dpi=72*ratio, format='png', color=color)
+    except ValueError:
+        return None
+
+    pixmap = QtGui.QPixmap.fromImage(QtGui.QImage.fromData(buf.getvalue(), 'PNG'))
+    pixmap.setDevicePixelRatio(ratio)
+    return pixmap
+
+
+class MathTextDelegate(QtWidgets.QStyledItemDelegate):
+
+    def __init__(self, parent=None):
+        """ item delegate that draws trace labels with mathtext (i.e. '$S_{21}$') the same way as the legend.
+            Labels are rendered the first time their row is painted, and the pixmaps are cached per label.
+            Labels without '$' are drawn as plain text.
+        """
+        super().__init__(parent)
+        self.cache = {}
+
+    def label_pixmap(self, label, option):
+        if label == None or '$' not in label:
+            return None
+
+        selected = option.state & QtWidgets.QStyle.State_Selected
+        color = option.palette.color(QtGui.QPalette.HighlightedText if selected else QtGui.QPalette.Text)
+        ratio = option.widget.devicePixelRatioF() if option.widget != None else 1.0
+        size = QtGui.QFontInfo(option.font).pixelSize()
+
+        key = (label, color.name(), size, ratio)
+        if key not in self.cache:
+            self.cache[key] = mathtext_pixmap(label, size, color.name(), ratio)
+        return self.cache[key]
+
+    def paint(self, painter, option, index):
+        pixmap = self.label_pixmap(index.data(Qt.DisplayRole), option)
+        if pixmap == None:
+            return super().paint(painter, option, index)
+
+        ## draw the check box, color and background of the row without text, then the label pixmap in the text area
+        opt = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ''
+        widget = option.widget
+        style = widget.style() if widget != None else QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_ItemViewItem, opt, painter, widget)
+
+        rect = style.subElementRect(QtWidgets.QStyle.SE_ItemViewItemText, opt, widget)
+        ratio = pixmap.devicePixelRatio()
+        w, h = pixmap.width()/ratio, pixmap.height()/ratio
+        ## rows have a uniform height, labels that are taller than the row are scaled down
+        scale = min(1.0, rect.height()/h) if h > 0 else 1.0
+
+        painter.save()
+        painter.setClipRect(rect)
+        target = QtCore.QRectF(rect.left() + 2, rect.center().y() - h*scale/2, w*scale, h*scale)
+        painter.drawPixmap(target, pixmap, QtCore.QRectF(pixmap.rect()))
+        painter.restore()
+
+
+class TracePanel(QGroupBox):
+
+    def __init__(self, title):
+        """ trace list of an axes with a filter box and a checkbox for all traces that pass the filter.
+            The list view only renders the rows that are scrolled into view, so the panel opens in the
+            same time for any number of traces.
+        """
+        super().__init__(title)
+        self.model = TraceModel(self)
+
+        self.proxy = QtCore.QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+        self.search = QLineEdit(self)
+        self.search.setPlaceholderText('Filter traces')
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(self.filter_changed)
+
+        self.cb_all = CheckBox('All')
+        self.cb_all.stateChanged.connect(self.all_changed)
+
+        self.view = QtWidgets.QListView(self)
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setItemDelegate(MathTextDelegate(self.view))
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.search)
+        layout.addWidget(self.cb_all)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+        self._updating = False
+        self.model.dataChanged.connect(self.update_all_cb)
+        self.model.modelReset.connect(self.update_all_cb)
+
+    def set_traces(self, traces):
+        self.model.set_traces(traces)
+        ## the filter and checkbox for all traces are only useful with more than one trace
+        self.search.setVisible(len(traces) > 1)
+        self.cb_all.setVisible(len(traces) > 1)
+
+    def filtered_rows(self):
+        """ returns the model rows of the traces that pass the filter
+        """
+        return [self.proxy.mapToSource(self.proxy.index(i, 0)).row() for i in range(self.proxy.rowCount())]
+
+    def filter_changed(self, text):
+        self.proxy.setFilterFixedString(text)
+        self.update_all_cb()
+
+    def update_all_cb(self, *args):
+        traces = self.model.traces
+        checks = [traces[row][1].get_visible() for row in self.filtered_rows()]
+
+        self._updating = True
+        if len(checks) and all(checks):
+            self.cb_all.setCheckState(Qt.CheckState.Checked)
+        elif any(checks):
+            self.cb_all.setCheckState(Qt.CheckState.PartiallyChecked)
+        else:
+            self.cb_all.setCheckState(Qt.CheckState.Unchecked)
+        self._updating = False
+
+    def all_changed(self, state):
+        if self._updating:
+            return
+        ## a partially checked state is only set by update_all_cb, clicking through it shows all traces
+        self.model.set_visible(self.filtered_rows(), Qt.CheckState(state) != Qt.Unchecked)
+        self.update_all_cb()
+
+
 def interactive_subplots(nrows=1, ncols=1, **kwargs):
     app = PlotWindow(nrows, ncols, **kwargs)
     ax = np.array(app.ax)
@@ -0,0 +1,124 @@
+import numpy as np
+from collections import OrderedDict
+
+def spread_intervals(loc_array, ymin, ymax):
+    """ moves a set of intervals (i.e. label extents) so none of them overlap, while keeping each interval as close 
+        as possible to its original location (least squares) and inside ymin and ymax. If the intervals don't fit 
+        between ymin and ymax, the lowest interval is kept inside ymin.
+
+        The intervals must be sorted by their center. The problem is solved with a pool adjacent violators pass, 
+        which runs in linear time.
+
+        Parameters
+        ----------
+            loc_array: (np.ndarray) Nx2 array of (lower, upper) interval bounds
+            ymin: (float) lower bound of all intervals
+            ymax: (float) upper bound of all intervals
+
+        Returns
+        -------
+            Nx2 array with the moved intervals
+    """
+    loc_array = np.asarray(loc_array, dtype='float64')
+    height = loc_array[:,1] - loc_array[:,0]
+    center = (loc_array[:,1] + loc_array[:,0])/2
+
+    ## offset of each center from the first center if all intervals were stacked edge to edge.
+    ## the intervals don't overlap if the centers minus the offsets are non-decreasing.
+    offset = np.concatenate(([0], np.cumsum((height[:-1] + height[1:])/2)))
+    target = center - offset
+
+    ## pool adjacent violators, each block holds (mean, size)
+    means, sizes = [], []
+    for v in target:
+        m, n = v, 1
+        while len(means) and means[-1] > m:
+            pm, pn = means.pop(), sizes.pop()
+            m = (pm*pn + m*n)/(pn + n)
+            n += pn
+        means.append(m)
+        sizes.append(n)
+
+    z = np.repeat(means, sizes)
+
+    ## axes bounds, applied to the first and last interval
+    z = np.minimum(z, ymax - height[-1]/2 - offset[-1])
+    z = np.maximum(z, ymin + height[0]/2)
+
+    center = z + offset
+    return np.column_stack((center - height/2, center + height/2))
+
+class ExtentCache(object):
+
+    def __init__(self, maxsize=2048, normalize_digits=True):
+        """ least recently used cache of text extents, relative to the text position.
+
+            Parameters
+            ----------
+                maxsize: (int) maximum number of cached extents
+                normalize_digits: (bool) if True, all digits in the text are treated as '0' when building the cache key, 
+                                  so labels like '1.234' and '1.235' share an entry. This assumes the font has 
+                                  equal width digits, which is true for the default matplotlib font.
+        """
+        self.maxsize = maxsize
+        self.normalize_digits = normalize_digits
+        self.hits = 0
+        self.misses = 0
+        self._extents = OrderedDict()
+
+    def key(self, text):
+        """ returns the cache key of a Text artist
+        """
+        s = text.get_text()
+        if self.normalize_digits:
+            s = s.translate(_digits)
+
+        patch = text.get_bbox_patch()
+        if patch == None:
+            boxstyle = None
+        else:
+            style = patch.get_boxstyle()
+            boxstyle = (type(style).__name__, tuple(sorted(vars(style).items())), patch.get_linewidth())
+
+        return (s, hash(text.get_fontproperties()), text.get_horizontalalignment(), text.get_verticalalignment(), 
+                text.get_rotation(), text.get_linespacing(), text.get_usetex(), boxstyle, text.figure.dpi)
+
+    def get_window_extent(self, text, renderer):
+        """ returns the display extent of text at its current position, measuring it only if no text with the same 
+            key has been measured before. Invisible text is measured as if it were visible.
+        """
+        x, y = text.get_transform().transform(text.get_unitless_position())
+        key = self.key(text)
+
+        extent = self._extents.get(key, None)
+        if extent is not None:
+            self._extents.move_to_end(key)
+            self.hits += 1
+            return extent.translated(x, y)
+
+        self.misses += 1
+        visible = text.get_visible()
+        text.set_visible(True)
+        extent = text.get_window_extent(renderer)
+        text.set_visible(visible)
+
+        self._extents[key] = extent.translated(-x, -y)
+        if len(self._extents) > self.maxsize:
+            self._extents.popitem(last=False)
+
+        return extent
+
+    def stats(self):
+        """ returns a dictionary with the cache hits, misses and size
+        """
+        return dict(hits=self.hits, misses=self.misses, size=len(self._extents), maxsize=self.maxsize)
+
+    def clear(self):
+        self._extents.clear()
+        self.hits = 0
+        self.misses = 0
+
+_digits = str.maketrans('123456789', '000000000')
+
+## extent cache shared by all markers
+extent_cache = ExtentCache()
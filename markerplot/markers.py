@@ -1,17 +1,336 @@
 
 import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.artist import Artist
 from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
+from matplotlib.transforms import Bbox
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from time import time, sleep
+import weakref
 from threading import Timer, Semaphore
+from . spatial import DisplayGrid
+from . layout import spread_intervals, extent_cache
+from . profiling import EventProfiler
 ##
 
+def axes_extents(ax, renderer):
+    """ returns the window extents of an axes and its decorations (tick labels, titles, legends). Data lines
+        are left out, they are drawn separately from the blitting background.
+    """
+    artists = [a for a in ax.get_default_bbox_extra_artists() if not isinstance(a, Line2D)]
+    return ax.get_tightbbox(renderer, bbox_extra_artists=artists)
+
+def line_version(l):
+    """ returns the data version (xversion, yversion) of a line. The versions are bumped by the patched Line2D 
+        set_xdata/set_ydata and by set_marker_xdata(), and every per-line cache is only valid for the version 
+        it was built from.
+    """
+    return (getattr(l, '_marker_xversion', 0), getattr(l, '_marker_yversion', 0))
+
+def set_marker_xdata(l, mxd):
+    """ sets x-data used for the marker xlabels of line l, independent of the line x-data (see the marker_xd
+        argument of axes.plot)
+    """
+    l._marker_xdata = mxd
+    l._marker_xd_fixed = True
+    l._marker_xversion = getattr(l, '_marker_xversion', 0) + 1
+
+def line_xsearch(l):
+    """ returns the search table (xdata, xsorted, direction) for the marker x-data of a line.
+        direction is 1 for ascending data, -1 for descending data and 0 if the data is not monotonic.
+        The table is cached on the line and rebuilt only when the line x-version changes.
+    """
+    version = line_version(l)[0]
+    cache = getattr(l, '_marker_xsearch', None)
+    if cache is not None and cache[0] == version:
+        return cache[1:]
+
+    xdata = np.asarray(l._marker_xdata)
+    xsorted, direction = None, 0
+    if np.isrealobj(xdata) and len(xdata):
+        diff = np.diff(xdata)
+        if np.all(diff > 0):
+            xsorted, direction = np.ascontiguousarray(xdata), 1
+        elif np.all(diff < 0):
+            ## keep an ascending copy so searchsorted can bisect descending data
+            xsorted, direction = np.ascontiguousarray(xdata[::-1]), -1
+
+    l._marker_xsearch = (version, xdata, xsorted, direction)
+    return l._marker_xsearch[1:]
+
+def line_xbounds(l):
+    """ returns the (min, max) of the marker x-data of a line, cached for the line x-version
+    """
+    version = line_version(l)[0]
+    cache = getattr(l, '_marker_xbounds', None)
+    if cache is not None and cache[0] == version:
+        return cache[1]
+
+    xdata, xsorted, direction = line_xsearch(l)
+    if direction != 0:
+        bounds = (xsorted[0], xsorted[-1])
+    else:
+        bounds = (np.min(xdata), np.max(xdata))
+
+    l._marker_xbounds = (version, bounds)
+    return bounds
+
+def nearest_index(l, xd):
+    """ returns the index and distance of the sample in the line marker x-data that is nearest to xd.
+        Monotonic data is searched by bisection, otherwise all samples are scanned.
+    """
+    xdata, xsorted, direction = line_xsearch(l)
+
+    if direction == 0:
+        dist = np.abs(xdata - xd)
+        idx = np.argmin(dist)
+        return int(idx), dist[idx]
+
+    n = len(xsorted)
+    i = np.searchsorted(xsorted, xd)
+    if i >= n:
+        i = n-1
+    elif i > 0:
+        ## ties go to the lower index of the original array, matching argmin
+        dl, dr = xd - xsorted[i-1], xsorted[i] - xd
+        if (dl < dr) or (dl == dr and direction > 0):
+            i -= 1
+
+    dist = abs(xsorted[i] - xd)
+    if direction < 0:
+        i = n-1-i
+    return int(i), dist
+
+def nearest_index_polar(l, xd):
+    """ polar version of nearest_index(), for angles in radians. Distances wrap around by one turn, so the samples 
+        at -pi and pi are both next to xd=pi.
+    """
+    xdata, xsorted, direction = line_xsearch(l)
+
+    if direction == 0:
+        ## min(|d|, |d - 2pi|, |d + 2pi|) is |pi - ||d| - pi||, computed in place in a single array
+        dist = np.subtract(xdata, xd)
+        np.abs(dist, out=dist)
+        np.subtract(dist, np.pi, out=dist)
+        np.abs(dist, out=dist)
+        np.subtract(np.pi, dist, out=dist)
+        np.abs(dist, out=dist)
+        idx = np.argmin(dist)
+        return int(idx), dist[idx]
+
+    idx, mdist = nearest_index(l, xd)
+    for x in (xd - 2*np.pi, xd + 2*np.pi):
+        i, d = nearest_index(l, x)
+        if d < mdist:
+            idx, mdist = i, d
+    return idx, mdist
+
+def nearest_indices(l, xd):
+    """ vectorized version of nearest_index(), returns arrays with the index and distance of the sample nearest
+        to each value in xd
+    """
+    xd = np.asarray(xd, dtype='float64')
+    xdata, xsorted, direction = line_xsearch(l)
+
+    if direction == 0:
+        if np.isrealobj(xdata) and len(xdata) > 1 and not np.any(np.isnan(xdata)):
+            idx = nearest_unsorted(xdata, xd)
+            return idx, np.abs(xdata[idx] - xd)
+
+        idx = np.zeros(len(xd), dtype=np.intp)
+        dist = np.zeros(len(xd))
+        for j, x in enumerate(xd):
+            idx[j], dist[j] = nearest_index(l, x)
+        return idx, dist
+
+    n = len(xsorted)
+    i = np.clip(np.searchsorted(xsorted, xd), 1, max(n-1, 1)) if n > 1 else np.zeros(len(xd), dtype=np.intp)
+    if n > 1:
+        dl, dr = xd - xsorted[i-1], xsorted[i] - xd
+        i = np.where((dl < dr) | ((dl == dr) & (direction > 0)), i-1, i)
+
+    dist = np.abs(xsorted[i] - xd)
+    if direction < 0:
+        i = n-1-i
+    return i, dist
+
+def nearest_unsorted(xdata, xd):
+    """ returns the index of the sample in xdata (real, without nan values, in any order) nearest to each value in xd. 
+        Ties go to the lowest index, matching np.argmin(np.abs(xdata - x)).
+    """
+    ## stable sort, so each run of equal values starts with its lowest index
+    order = np.argsort(xdata, kind='stable')
+    xs = xdata[order]
+
+    i = np.clip(np.searchsorted(xs, xd), 1, len(xs)-1)
+    lv, rv = xs[i-1], xs[i]
+    li = order[np.searchsorted(xs, lv)]
+    ri = order[np.searchsorted(xs, rv)]
+
+    dl, dr = np.abs(xd - lv), np.abs(rv - xd)
+    return np.where(dl < dr, li, np.where(dr < dl, ri, np.minimum(li, ri)))
+
+def linked_index_map(src, dst):
+    """ returns an array that maps each index of the marker x-data of line src to the index of the nearest sample 
+        on line dst. Lines that share an x-grid map each index to itself, other lines are mapped by searching 
+        dst for every sample of src. Returns None if dst can't be searched in bulk (x-data that isn't real, or
+        unordered x-data with nan values).
+        Maps are cached on src for the x-versions of both lines.
+    """
+    version = (line_version(src)[0], line_version(dst)[0])
+    maps = getattr(src, '_marker_linkmaps', None)
+    if maps is None:
+        maps = src._marker_linkmaps = {}
+
+    cache = maps.get(id(dst))
+    if cache is not None and cache[0] == version and cache[1]() is dst:
+        return cache[2]
+
+    sx, dx = np.asarray(src._marker_xdata), np.asarray(dst._marker_xdata)
+    if sx is dx or (len(sx) == len(dx) and np.array_equal(sx, dx)):
+        imap = np.arange(len(sx))
+    elif np.isrealobj(sx) and np.isrealobj(dx) and (line_xsearch(dst)[2] != 0 or not np.any(np.isnan(dx))):
+        imap = nearest_indices(dst, sx)[0]
+    else:
+        imap = None
+
+    maps[id(dst)] = (version, weakref.ref(dst), imap)
+    return imap
+
+def partial_blit(canvas):
+    """ returns True if the canvas can restore part of a saved background region (Agg based canvases).
+        Other canvases restore and blit the full axes bbox.
+    """
+    return isinstance(canvas, FigureCanvasAgg) and canvas.supports_blit
+
+def restore_damage(canvas, region, bbox):
+    """ restores the part of a saved region (from canvas.copy_from_bbox) that lies inside bbox (display coordinates)
+    """
+    ## saved regions use pixel coordinates measured from the top of the figure
+    h = canvas.figure.bbox.height
+    rx0, ry0, rx1, ry1 = region.get_extents()
+    x0, y0, x1, y1 = bbox.extents
+    x0, x1 = max(int(np.floor(x0)), rx0), min(int(np.ceil(x1)), rx1)
+    y0, y1 = max(int(h - np.ceil(y1)), ry0), min(int(h - np.floor(y0)), ry1)
+    if x1 > x0 and y1 > y0:
+        canvas.restore_region(region, bbox=(x0, y0, x1, y1), xy=(rx0, ry0))
+
+def union_extents(*bboxes):
+    """ returns the union of the bboxes that are not None, or None
+    """
+    bboxes = [b for b in bboxes if b is not None]
+    return Bbox.union(bboxes) if len(bboxes) else None
+
+def snap_bbox(bbox, clip=None, margin=1):
+    """ returns bbox grown out to whole pixels plus margin, and limited to clip. Returns None if bbox is None or
+        outside of clip. Saved regions of snapped bboxes include the pixels that are only partly covered by bbox.
+    """
+    if bbox is None:
+        return None
+    bbox = Bbox([np.floor(bbox.p0) - margin, np.ceil(bbox.p1) + margin])
+    return bbox if clip is None else Bbox.intersection(bbox, clip)
+
+def draw_clipped(artist, renderer, bbox):
+    """ draws artist and all of its children clipped to bbox (display coordinates)
+    """
+    saved = []
+    for a in artist.findobj(include_self=True):
+        clip_box, clip_path, clip_on, visible = a.get_clip_box(), a.get_clip_path(), a.get_clip_on(), a.get_visible()
+        saved.append((a, clip_box, clip_path, clip_on, visible))
+        box = Bbox.intersection(clip_box, bbox) if (clip_on and clip_box != None) else bbox
+        ## containers (i.e. an axis and its tick labels) stay visible, their children are clipped on their own
+        if box == None and len(a.get_children()) < 1:
+            a.set_visible(False)
+        else:
+            ## artists that weren't clipped (i.e. tick labels) can still have the axes patch as clip path
+            if not clip_on:
+                a.set_clip_path(None)
+            a.set_clip_box(bbox if box == None else box)
+            a.set_clip_on(True)
+
+    artist.draw(renderer)
+
+    for a, clip_box, clip_path, clip_on, visible in saved:
+        a.set_clip_box(clip_box)
+        a.set_clip_path(clip_path)
+        a.set_clip_on(clip_on)
+        a.set_visible(visible)
+
+def add_markers(axes, xd=None, idx=None, lines=None):
+    """ creates a marker on axes for each value in xd, or each index in idx. The line analysis and nearest point 
+        search are done once for all markers.
+
+        Returns
+        -------
+            list of Marker objects
+    """
+    line_info = Marker.get_line_info(axes, lines)
+    mlines, index_mode, monotonic, xbounds = line_info
+
+    polar = any(ax.name == 'polar' for ax, l in mlines) and axes.marker_params['show_xline']
+
+    if idx is not None and not index_mode:
+        raise RuntimeError('xdata or display cordinates must be provided if not in index mode')
+
+    if idx is not None:
+        idx = np.asarray(idx, dtype=np.intp)
+        xdpoint = np.asarray(mlines[0][1]._marker_xdata)[idx]
+        xidx = np.tile(idx, (len(mlines), 1))
+
+    elif polar:
+        ## polar axes search with wrap-around, create markers one at a time
+        return [Marker(axes, xd=x, line_info=line_info) for x in xd]
+
+    else:
+        ## nearest point across all lines
+        search = [nearest_indices(l, xd) for ax, l in mlines]
+        dist = np.array([d for i, d in search])
+        mline = np.argmin(dist, axis=0)
+        xdpoint = np.array([mlines[k][1]._marker_xdata[search[k][0][j]] for j, k in enumerate(mline)])
+
+        if index_mode:
+            idx = np.array([search[k][0][j] for j, k in enumerate(mline)], dtype=np.intp)
+            xdpoint = np.asarray(mlines[0][1]._marker_xdata)[idx]
+            xidx = np.tile(idx, (len(mlines), 1))
+        else:
+            xidx = np.array([nearest_indices(l, xdpoint)[0] for ax, l in mlines])
+
+    return [Marker(axes, xd=xdpoint[j], line_info=line_info, xidx=xidx[:,j]) for j in range(len(xdpoint))]
+
+def transform_key(ax):
+    """ returns a fingerprint of the axes data transform, taken from the display location of the view limits
+    """
+    x0, y0, x1, y1 = ax.viewLim.extents
+    return ax.transData.transform(((x0, y0), (x1, y1), ((x0+x1)/2, (y0+y1)/2))).tobytes()
+
+def line_display_xy(ax, l):
+    """ returns the line data in display coordinates and stores it in l.xy. The result is cached on the line,
+        so markers that share a line only transform it once for each data array and axes transform.
+    """
+    version = line_version(l)
+    key = transform_key(ax)
+    cache = getattr(l, '_marker_xycache', None)
+
+    if cache is None or cache[0] != version or cache[1] != key:
+        l.xy = ax.transData.transform(l.get_xydata())
+        l._marker_xycache = (version, key)
+
+    return l.xy
+
+def line_display_grid(l):
+    """ returns the display-space grid of the line points in l.xy, rebuilding it if l.xy has been replaced
+        (l.xy is only replaced when the line version or the axes transform changes)
+    """
+    grid = getattr(l, '_marker_grid', None)
+    if grid is None or grid.xy is not l.xy:
+        grid = l._marker_grid = DisplayGrid(l.xy)
+    return grid
+
+
 class Marker(object):
     
-    def __init__(self, axes, xd=None, idx=None, disp=None, lines=None):
+    def __init__(self, axes, xd=None, idx=None, disp=None, lines=None, line_info=None, xidx=None):
         """ create marker on axes at a given x data value, data index value or display coordinate
 
             Parameters
@@ -19,6 +338,9 @@ class Marker(object):
                 xd: (float) x-value in data coordinates
                 disp: (tuple) x,y value in axes display cordinates
                 idx: (int) index of x-data (ignored if axes data lines have unequal xdata arrays)
+                line_info: (tuple) result of Marker.get_line_info(), if already computed for axes and lines
+                xidx: (list) data index for each line. If provided, xd is used as the marker point and the
+                      nearest point search is skipped.
         """
         self.axes = axes 
         ## marker will inherit these parameters from axes, ignoring params from linked axes
@@ -44,38 +366,69 @@ class Marker(object):
         self.display2data = self.axes.transData.inverted().transform
 
         self.base_origin = list(self.display2data((0,0)))
-        self.lines = []
 
+        if line_info == None:
+            line_info = self.get_line_info(axes, lines)
+        self.lines, self.index_mode, monotonic_flag, xbounds = line_info
+        
+        self.ydot = [None]*len(self.lines)
+        self.yline = [None]*len(self.lines)
+        self.ytext = [None]*len(self.lines)
+        self.xdpoint = None
+        self.xidx = [0]*len(self.lines)
+        ## markers on non-interactive figures are only laid out when they are drawn, so creating them doesn't 
+        ## need a renderer
+        self.defer_layout = not getattr(axes.figure, '_marker_interactive', True)
+        self.renderer = None if self.defer_layout else self.axes.figure.canvas.get_renderer()
+        self.line_xbounds = list(xbounds)
+        ## x-version of each line when line_xbounds was taken, see check_lines()
+        self._line_xversions = [line_version(l)[0] for ax, l in self.lines]
+        self._hidden_markers = []
+        ## display region covered by the marker when it was last drawn on the canvas, see draw()
+        self.extents = None
+
+        if not monotonic_flag:
+            self.show_xline = False
+            self.show_xlabel = False
+
+        self.create(xd, idx=idx, disp=disp, xidx=xidx)
+
+    @staticmethod
+    def get_line_info(axes, lines=None):
+        """ collects the data lines that a marker on axes will be placed on, and checks if markers can use index mode.
+            The result can be shared by any number of markers created on axes with the same lines.
+
+            Returns
+            -------
+                (lines, index_mode, monotonic, xbounds)
+                    lines: list of (axes, line) tuples
+                    index_mode: (bool) True if all lines (including lines on linked axes) have identical x-data
+                    monotonic: (bool) True if the x-data of every line is monotonic
+                    xbounds: list of (min, max) of the marker x-data of each line
+        """
+        mlines = []
         if np.any(lines):
             ## use lines if provided
             if not isinstance(lines, (tuple, list, np.ndarray)):
                 lines = [lines]
             for l in lines:
-                self.lines.append((l.axes, l))
+                mlines.append((l.axes, l))
 
         else:
             ## get lines from any shared axes
-            for ax in self.axes.get_shared_x_axes().get_siblings(self.axes):
+            for ax in axes.get_shared_x_axes().get_siblings(axes):
                 for l in ax.lines:
-                    if (l not in ax.marker_ignorelines) and (l not in self.axes.marker_ignorelines):
-                        self.lines.append((ax,l))
-        
-        self.ydot = [None]*len(self.lines)
-        self.yline = [None]*len(self.lines)
-        self.ytext = [None]*len(self.lines)
-        self.xdpoint = None
-        self.xidx = [0]*len(self.lines)
-        self.renderer = self.axes.figure.canvas.get_renderer()
-        self.line_xbounds = [None]*len(self.lines)
-        self._hidden_markers = []
+                    if (l not in ax.marker_ignorelines) and (l not in axes.marker_ignorelines):
+                        mlines.append((ax,l))
 
-        if (len(self.lines) < 1):
+        if (len(mlines) < 1):
             raise RuntimeError('Markers cannot be added to axes without data lines.')
 
         ## turn on index mode if all lines have identical x-data
         monotonic_flag = True
-        xcheck = np.zeros(shape=(len(self.lines), 3))
-        for i, (ax,l) in enumerate(self.lines):
+        xcheck = []
+        xbounds = []
+        for i, (ax,l) in enumerate(mlines):
 
             if not hasattr(l, '_marker_xdata'):
                 l._marker_xdata = l.get_xdata()
@@ -84,29 +437,26 @@ class Marker(object):
                 diff = np.diff(l.get_xdata())
                 monotonic_flag = np.all(diff > 0) or np.all(diff < 0)
 
-            xcheck[i] = l._marker_xdata[0], l._marker_xdata[-1], len(l._marker_xdata)
+            xcheck.append((l._marker_xdata[0], l._marker_xdata[-1], len(l._marker_xdata)))
+            xbounds.append(line_xbounds(l))
 
-            l.xy = self.data2display(ax, l.get_xydata())
+            line_display_xy(ax, l)
 
-        for ax in self.axes.marker_linked_axes:
+        for ax in axes.marker_linked_axes:
             for l in ax.lines:
-                if (l in ax.marker_ignorelines or l in self.axes.marker_ignorelines):
+                if (l in ax.marker_ignorelines or l in axes.marker_ignorelines):
                     continue
 
                 if not hasattr(l, '_marker_xdata'):
                     l._marker_xdata = l.get_xdata()
 
                 xdata = l._marker_xdata
-                xcheck = np.append(xcheck, [[xdata[0], xdata[-1], len(xdata)]], axis=0)
-
-        self.index_mode = np.all(xcheck == xcheck[0,:]) 
+                xcheck.append((xdata[0], xdata[-1], len(xdata)))
 
-        if not monotonic_flag:
-            self.index_mode = False
-            self.show_xline = False
-            self.show_xlabel = False
+        xcheck = np.array(xcheck)
+        index_mode = np.all(xcheck == xcheck[0,:]) and monotonic_flag
 
-        self.create(xd, idx=idx, disp=disp)
+        return mlines, index_mode, monotonic_flag, xbounds
 
     def update_params(self):
         self.show_xline = axes.marker_params['show_xline']
@@ -120,10 +470,16 @@ class Marker(object):
         self.ylabel_ypad = axes.marker_params['ylabel_ypad']
         self.update_marker(move=True)
 
-    def update_marker(self, move=True):
+    def update_marker(self, move=True, renderer=None):
         """ updates marker (without drawing on canvas) if the dpi or figure size changes
+
+            Parameters
+            ----------
+                move: (bool) if True, the marker is placed again at its current point
+                renderer: (RendererBase) renderer used to lay out the labels (i.e. the renderer of a draw_event),
+                          defaults to the canvas renderer. Vector canvases (pdf, svg) don't have a canvas renderer.
         """
-        self.renderer = self.axes.figure.canvas.get_renderer()
+        self.renderer = renderer if renderer != None else self.axes.figure.canvas.get_renderer()
 
         self.xlabel_pad = self.axes.marker_params['xlabel_pad']
         self.ylabel_xpad = self.axes.marker_params['ylabel_xpad']
@@ -136,7 +492,7 @@ class Marker(object):
         self.display2data = self.axes.transData.inverted().transform
 
         for i, (ax,l) in enumerate(self.lines):
-            l.xy = self.data2display(ax, l.get_xydata())
+            line_display_xy(ax, l)
 
         self.base_origin = list(self.display2data((0,0)))
 
@@ -155,42 +511,27 @@ class Marker(object):
             if self.show_xline:
                 if disp != None:
                     xd, yd = self.display2data(disp)
-                xl = l._marker_xdata
                 if (ax.name == 'polar'):
-                    dist = np.full(fill_value=np.inf, shape=(3, len(xl)))
-                    dist[0] = np.abs(xl - xd)
-                    dist[1] = np.abs((xl +2*np.pi) -xd)
-                    dist[2] = np.abs((xl -2*np.pi) -xd)
-
-                    xlist = np.zeros(shape=(len(dist), 2))
-                    for i in range(len(dist)):
-                        idx = np.argmin(dist[i])
-                        xlist[i] = idx, dist[i][idx]
-
-                    min_idx = np.argmin(xlist[:,1])
-                    xidx_l, mdist_l = xlist[min_idx]
+                    xidx_l, mdist_l = nearest_index_polar(l, xd)
                 else:
-                    dist = np.abs(xl - xd)
-                    xidx_l, mdist_l = np.argmin(dist), np.min(dist) 
+                    xidx_l, mdist_l = nearest_index(l, xd)
                 
             else:
                 if disp != None:
-                    xl, yl = l.xy[:,0], l.xy[:,1]
-                    dist = np.abs(xl - x) + np.abs(yl-y)
+                    xidx_l, mdist_l = line_display_grid(l).nearest(x, y)
                 else:
-                    xl = l._marker_xdata
-                    dist = np.abs(xl - xd)
-
-                xidx_l, mdist_l = np.argmin(dist), np.min(dist)  
+                    xidx_l, mdist_l = nearest_index(l, xd)
             
             if mdist_l < mdist:
                 mline, xdpoint, mdist  = l, l._marker_xdata[int(xidx_l)], mdist_l
 
         return mline, xdpoint
 
-    def create(self, xd=None, disp=None, idx=None):
+    def create(self, xd=None, disp=None, idx=None, xidx=None):
 
-        if not self.index_mode:
+        if xidx is not None:
+            self.xdpoint = xd
+        elif not self.index_mode:
             if xd == None and disp == None:
                 raise RuntimeError('xdata or display cordinates must be provided if not in index mode')
             mline, self.xdpoint = self.find_nearest_xdpoint(xd, disp=disp)
@@ -204,7 +545,7 @@ class Marker(object):
         boxparams = dict(boxstyle='round', facecolor='black', edgecolor='black', alpha=0.7)
 
         self.xline = self.axes.axvline(self.xdpoint, linewidth=0.5, color='r')
-        self.axes.marker_ignorelines.append(self.xline)
+        self.axes.marker_ignorelines.add(self.xline)
 
         ## x label
         x0, y0 = self.axes2display((0,0))
@@ -223,70 +564,23 @@ class Marker(object):
             self.ydot[i].set_linestyle(':')
             ax.add_line(self.ydot[i])
             ax.add_line(self.yline[i])
-            self.axes.marker_ignorelines.append(self.ydot[i])
-            self.axes.marker_ignorelines.append(self.yline[i])
-            ax.marker_ignorelines.append(self.ydot[i])
-            ax.marker_ignorelines.append(self.yline[i])
+            self.axes.marker_ignorelines.add(self.ydot[i])
+            self.axes.marker_ignorelines.add(self.yline[i])
+            ax.marker_ignorelines.add(self.ydot[i])
+            ax.marker_ignorelines.add(self.yline[i])
             
-            self.line_xbounds[i] = np.min(l._marker_xdata), np.max(l._marker_xdata)
-
         ## move objects to current point
-        self.move_to_point(xd, disp=disp, idx=idx)
+        self.move_to_point(xd, disp=disp, idx=idx, xidx=xidx, layout=not self.defer_layout)
         self.set_visible(False)
 
-    def compute_shift_label(self, loc_array, idx, shift):
-        loc_array[idx, :] += shift
-        if shift > 0:
-            for i in range(idx+1, len(loc_array)):
-                ovl = loc_array[i, 0] - loc_array[i-1, 1]
-                if ovl < 0: 
-                    loc_array[i, :] += abs(ovl)
-        else:
-            for i in range(idx-1, -1, -1):
-                ovl = loc_array[i+1, 0] - loc_array[i, 1]
-                if ovl < 0:
-                    loc_array[i, :] -= abs(ovl)
-
-
     def _compute_ylabel_loc(self, loc_array, ymin, ymax):
+        loc_array[:] = spread_intervals(loc_array, ymin, ymax)
 
-        size = len(loc_array)
-        for i in range(int(size/2),  size):
-            if i > (size-2):
-                continue
-            ovl = loc_array[i+1, 0] - loc_array[i, 1]
-            if ovl > 0: 
-                continue
-
-            self.compute_shift_label(loc_array, i, -abs(ovl)/2)
-            self.compute_shift_label(loc_array, i+1, abs(ovl)/2)
-
-        for i in range(int(size/2), -1, -1):
-            if i < 1:
-                continue
-            ovl = loc_array[i, 0] - loc_array[i-1, 1]
-            if ovl > 0: 
-                continue
-
-            self.compute_shift_label(loc_array, i-1, -abs(ovl)/2)
-            self.compute_shift_label(loc_array, i, abs(ovl)/2)
-
-        max_ovl = ymax - loc_array[-1, 1]
-        min_ovl = loc_array[0, 0] - ymin
-
-        if max_ovl < 0:
-            self.compute_shift_label(loc_array, len(loc_array)-1, max_ovl)
-        if min_ovl < 0:
-            self.compute_shift_label(loc_array, 0, abs(min_ovl))
-
-    
     def space_labels(self):
         """ seperates overlapping ylabels with a spacing given by self.ylabel_ypad
         """
 
-        ## make the marker visible so get_window_extent works properly
-        self.set_visible(True)
-
+        ## text extents come from the shared extent cache, which also handles invisible labels
         xmin, ymin = self.axes2display((0,0))
         xmax, ymax = self.axes2display((1,1))
 
@@ -297,7 +591,7 @@ class Marker(object):
         xmin += self.ylabel_xpad
 
         xl, yl = self.data2display(self.axes, (self.xdpoint, 0))
-        xlabel_dim = self.xtext.get_window_extent(self.renderer)
+        xlabel_dim = extent_cache.get_window_extent(self.xtext, self.renderer)
 
         x1, y1 = xlabel_dim.x0, xlabel_dim.y0
         x2, y2 = xlabel_dim.x1, xlabel_dim.y1
@@ -305,7 +599,7 @@ class Marker(object):
 
         ypos = ymin + (y2-y1)/2 + self.xlabel_pad - self.ylabel_ypad
         self.xtext.set_position((xl-xlen/2, ypos))
-        xlabel_dim = self.xtext.get_window_extent(self.renderer)
+        xlabel_dim = extent_cache.get_window_extent(self.xtext, self.renderer)
 
         if self.show_xlabel:
             ymin = xlabel_dim.y1 + self.ylabel_ypad
@@ -327,12 +621,11 @@ class Marker(object):
         ylabels = []
         for i, ytext in enumerate(self.ytext):
             if (i not in self._hidden_markers) and (self.lines[i][1].get_visible()):
-                dim = ytext.get_window_extent(self.renderer)
+                dim = extent_cache.get_window_extent(ytext, self.renderer)
                 dims.append(dim)
                 ylocs.append((dim.y1 + dim.y0)/2)
                 ylabels.append(ytext)
 
-        self.set_visible(False)
         if len(ylabels) < 1:
             return
 
@@ -371,25 +664,90 @@ class Marker(object):
             ytext.set_position((xloc, yloc))
         
 
-    def move_to_point(self, xd=None, disp=None, idx=None):
-        
+    def check_lines(self):
+        """ refreshes the x-bounds and indices of lines whose x-data changed since the marker last checked them,
+            so line data can be replaced without recreating the marker
+        """
+        changed = []
+        for i, (ax, l) in enumerate(self.lines):
+            version = line_version(l)[0]
+            if version == self._line_xversions[i]:
+                continue
+
+            changed.append(i)
+            self._line_xversions[i] = version
+            self.line_xbounds[i] = line_xbounds(l)
+            self.xidx[i] = min(self.xidx[i], max(len(l._marker_xdata) - 1, 0))
+
+        if len(changed) < 1:
+            return
+
+        ## index mode needs identical x-data on every line, compare the ends and length like get_line_info()
+        if self.index_mode:
+            x0 = self.lines[0][1]._marker_xdata
+            for ax_k, l_k in self.lines:
+                xk = l_k._marker_xdata
+                if len(xk) != len(x0) or (len(xk) and (xk[0] != x0[0] or xk[-1] != x0[-1])):
+                    self.index_mode = False
+                    changed = list(range(len(self.lines)))
+                    break
+
+        if self.xdpoint == None:
+            return
+
+        if self.index_mode:
+            ## lines share the marker index, the x-location follows the new x-data
+            self.xdpoint = self.lines[0][1]._marker_xdata[self.xidx[0]]
+        else:
+            ## lines with new x-data are placed on their sample nearest to the x-location, like move_to_point()
+            for i in changed:
+                self.xidx[i] = nearest_index(self.lines[i][1], self.xdpoint)[0]
+
+    def move_to_point(self, xd=None, disp=None, idx=None, xidx=None, layout=True):
+        """ moves the marker to the sample nearest to xd or disp, or to a data index
+
+            Parameters
+            ----------
+                layout: (bool) if False, only the marker indices are updated. The artists are placed and the labels
+                        spaced on the next update_marker().
+        """
+        self.check_lines()
+
         origin = list(self.axes.transData.inverted().transform((0,0)))
 
         if not np.all(origin == self.base_origin):
             self.update_marker(move=False)
 
-        if not self.index_mode:
+        if xidx is not None:
+            ## indices were already resolved by the caller
+            self.xdpoint = xd
+            self.xidx = [int(i) for i in xidx]
+        elif not self.index_mode:
             mline, self.xdpoint = self.find_nearest_xdpoint(xd, disp=disp)
 
             for i, (ax,l) in enumerate(self.lines):
-                self.xidx[i] = np.argmin(np.abs(l._marker_xdata-self.xdpoint))
+                self.xidx[i] = nearest_index(l, self.xdpoint)[0]
         else:
             if idx == None:
                 mline, self.xdpoint = self.find_nearest_xdpoint(xd, disp=disp)
-                idx = np.argmin(np.abs(mline._marker_xdata-self.xdpoint))
+                idx = nearest_index(mline, self.xdpoint)[0]
             for i, (ax,l) in enumerate(self.lines):
                 self.xidx[i] = idx
             self.xdpoint = self.lines[0][1]._marker_xdata[self.xidx[0]]
+
+        ## hide the ylabel and dot of lines without a valid point
+        for i, (ax,l) in enumerate(self.lines):
+            self.set_show(i)
+            if not self.index_mode:
+                if (self.xdpoint > self.line_xbounds[i][1]) or (self.xdpoint < self.line_xbounds[i][0]):
+                    self.set_hidden(i)
+            if not np.isfinite(l.get_ydata()[self.xidx[i]]):
+                self.set_hidden(i)
+
+        if not layout:
+            return
+        if self.renderer == None:
+            self.renderer = self.axes.figure.canvas.get_renderer()
         
         ## vertical line placement
         self.xline.set_xdata([self.xdpoint, self.xdpoint])
@@ -405,21 +763,12 @@ class Marker(object):
         yloc = []
         for i, (ax,l) in enumerate(self.lines):
             xlim = ax.get_xlim()
-            self.set_show(i)
-
-
-            if not self.index_mode:
-                ## turn off ylabel and dot if ypoint is out of bounds
-                if (self.xdpoint > self.line_xbounds[i][1]) or (self.xdpoint < self.line_xbounds[i][0]):
-                    self.set_hidden(i)
 
             ## ylabel and dot position
             xd, yd = l.get_xdata()[self.xidx[i]], l.get_ydata()[self.xidx[i]]
             xl, yl = self.data2display(ax, (np.real(xd), np.real(yd)))
 
-            if (not np.isfinite(yd)):
-                self.set_hidden(i)
-            else:
+            if np.isfinite(yd):
                 xpos = xl+self.ylabel_xpad if not self.show_yline else self.ylabel_xpad
                 self.ytext[i].set_position((xpos, yl))
                 self.ydot[i].set_data([xd], [yd])
@@ -481,16 +830,23 @@ class Marker(object):
                 self.move_to_point(new_xpoint)
 
     def remove(self):
+        """ removes the marker artists from their axes, and from the axes ignore lines
+        """
         if self.xline in self.axes.lines:
-            idx = self.axes.lines.index(self.xline)
-            self.axes.lines.pop(idx)
+            self.xline.remove()
+        if self.xtext in self.axes.texts:
+            self.xtext.remove()
+        self.axes.marker_ignorelines.discard(self.xline)
 
         for i, (ax,l) in enumerate(self.lines):	
-            if self.ydot[i] in ax.lines:
-                idx = ax.lines.index(self.ydot[i])
-                ax.lines.pop(idx)
-                idx = ax.lines.index(self.yline[i])
-                ax.lines.pop(idx)
+            for artist in (self.ydot[i], self.yline[i]):
+                if artist in ax.lines:
+                    artist.remove()
+                ax.marker_ignorelines.discard(artist)
+                self.axes.marker_ignorelines.discard(artist)
+
+            if self.ytext[i] in ax.texts:
+                self.ytext[i].remove()
 
     def set_visible(self, state):
         self.xtext.set_visible(self.show_xlabel and state)
@@ -521,23 +877,72 @@ class Marker(object):
         if idx in self._hidden_markers:
             self._hidden_markers.remove(idx)
 
-    def draw(self):
-        """ Draws each artist associated with marker."""
+    def draw(self, renderer=None):
+        """ Draws each artist associated with marker. Artists are drawn with the canvas renderer unless
+            a renderer is given (i.e. the renderer of a draw_event).
+        """
         
         self.set_visible(True)
 
-        self.axes.draw_artist(self.xline)
+        if renderer == None:
+            draw_artist = lambda a: a.axes.draw_artist(a)
+        else:
+            draw_artist = lambda a: a.draw(renderer)
+
+        draw_artist(self.xline)
         for i, (ax,l) in enumerate(self.lines):
-            self.yline[i].axes.draw_artist(self.yline[i])
-            self.ydot[i].axes.draw_artist(self.ydot[i])
-            self.ytext[i].axes.draw_artist(self.ytext[i])
+            draw_artist(self.yline[i])
+            draw_artist(self.ydot[i])
+            draw_artist(self.ytext[i])
             
-        self.axes.draw_artist(self.xtext)
+        draw_artist(self.xtext)
+
+        ## remember what the marker covers, so the next move only has to restore and blit that region
+        if renderer == None and partial_blit(self.axes.figure.canvas):
+            self.extents = self.get_extents()
 
         self.set_visible(False)
 
+    def get_extents(self):
+        """ returns the union of the display extents of the visible marker artists (including label boxes), 
+            padded for antialiasing, or None if nothing is visible
+        """
+        renderer = self.axes.figure.canvas.get_renderer()
+        boxes = []
+        for a in [self.xline] + self.yline + self.ydot:
+            if a.get_visible():
+                boxes.append(a.get_window_extent(renderer))
+
+        for a in [self.xtext] + self.ytext:
+            if not a.get_visible():
+                continue
+            patch = a.get_bbox_patch()
+            if patch == None:
+                boxes.append(a.get_window_extent(renderer))
+                continue
+            ## the label box holds the text. Its corners are cheaper to transform than the box path, 
+            ## which has curved corners.
+            p = getattr(patch.get_boxstyle(), 'pad', 0) * patch.get_mutation_scale()
+            w, h = patch.get_width(), patch.get_height()
+            corners = patch.get_transform().transform(((-p, -p), (w+p, -p), (-p, h+p), (w+p, h+p)))
+            boxes.append(Bbox((corners.min(axis=0), corners.max(axis=0))))
+
+        boxes = [b for b in boxes if np.all(np.isfinite(b.extents))]
+        if len(boxes) < 1:
+            return None
+        ## label box edges are stroked outside of the patch path
+        return Bbox.union(boxes).padded(3*self.axes.figure.dpi/100)
+
 class MarkerManager(object):
-    def __init__(self, fig, top_axes=None):
+    def __init__(self, fig, top_axes=None, max_fps=None):
+        """ event manager for interactive markers
+
+            Parameters
+            ----------
+                max_fps: (float) if provided, motion events are coalesced and the active marker is redrawn
+                         at most max_fps times per second, using the latest pointer position.
+                         If None, every motion event is drawn.
+        """
         self.fig = fig
         self.toolbar = self.fig.canvas.toolbar
 
@@ -546,17 +951,110 @@ class MarkerManager(object):
 
         self.zoom = False
 
+        ## number of full figure renders done by the manager, and the number caused by the last draw_event
+        self.render_count = 0
+        self.draw_event_renders = 0
+
+        self.max_fps = max_fps
+        self._pending_motion = None
+        self._motion_scheduled = False
+        self._last_motion = 0
+        self._motion_timer = None
+
+        ## event timing, see enable_profiling()
+        self.profiler = None
+
+        self.connect_events()
+
+    def connect_events(self):
+        """ connects the event handlers to the figure canvas
+        """
         self.cidclick = self.fig.canvas.mpl_connect('button_press_event', self.onclick)
         self.cidpress = self.fig.canvas.mpl_connect('key_press_event', self.onkey_press)
-        self.cidbtnrelease = self.fig.canvas.mpl_connect('key_release_event', self.onkey_release)
+        self.cidkeyrelease = self.fig.canvas.mpl_connect('key_release_event', self.onkey_release)
         self.cidmotion = self.fig.canvas.mpl_connect('motion_notify_event', self.onmotion)
         self.cidbtnrelease = self.fig.canvas.mpl_connect('button_release_event', self.onrelease)
         self.ciddraw = self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def disconnect_events(self):
+        for cid in (self.cidclick, self.cidpress, self.cidkeyrelease, self.cidmotion, self.cidbtnrelease, self.ciddraw):
+            self.fig.canvas.mpl_disconnect(cid)
+
+    def enable_profiling(self, overlay=False):
+        """ starts recording the time spent in each stage (nearest search, space_labels, artist draw, background
+            restore and blit) of every handled event. Returns the EventProfiler holding the timings, 
+            use profiler.summary() or profiler.dump() to read them.
+
+            Parameters
+            ----------
+                overlay: (bool) draw the event rate and latency of the last event in the top left corner of the figure
+        """
+        if self.profiler == None:
+            self.profiler = EventProfiler(self)
+        self.profiler.enable(overlay=overlay)
+        return self.profiler
+
+    def disable_profiling(self):
+        """ stops recording event timings, the event handlers run without any timing overhead once disabled.
+            Returns the EventProfiler with the timings recorded so far.
+        """
+        if self.profiler != None:
+            self.profiler.disable()
+        return self.profiler
         
     def move_linked(self, axes, x, y):
         axes.marker_active.move_to_point(disp=(x,y))
         for ax in axes.marker_linked_axes:
-            ax.marker_active.move_to_point(xd=axes.marker_active.xdpoint)
+            self.follow_marker(axes.marker_active, ax.marker_active)
+
+    def follow_marker(self, src, dst):
+        """ moves marker dst (on a linked axes) to the x-location of marker src. Indices on the lines of dst are 
+            looked up in the index maps from the src line the x-location was taken from, the lines are only
+            searched if a map can't be built.
+        """
+        ## the lines of src are the sources of the index maps, their indices must match their current x-data
+        src.check_lines()
+        xd = src.xdpoint
+        if dst.axes.name == 'polar':
+            dst.move_to_point(xd=xd)
+            return
+
+        ## line of src that holds the marker x-location
+        k = None
+        for i, (ax, l) in enumerate(src.lines):
+            if l._marker_xdata[src.xidx[i]] == xd:
+                k = i
+                break
+
+        if k == None:
+            dst.move_to_point(xd=xd)
+            return
+
+        src_line, src_idx = src.lines[k][1], src.xidx[k]
+        xidx = []
+        best, mdist = 0, np.inf
+        for j, (ax, l) in enumerate(dst.lines):
+            imap = linked_index_map(src_line, l)
+            if imap is None:
+                dst.move_to_point(xd=xd)
+                return
+
+            xidx.append(imap[src_idx])
+            ## dst is placed on the line sample nearest to xd, like find_nearest_xdpoint()
+            dist = abs(l._marker_xdata[xidx[j]] - xd)
+            if dist < mdist:
+                best, mdist = j, dist
+
+        ## the other lines of dst are placed on their sample nearest to the new x-location, like move_to_point()
+        best_line = dst.lines[best][1]
+        xdpoint = best_line._marker_xdata[xidx[best]]
+        for j, (ax, l) in enumerate(dst.lines):
+            if j == best:
+                continue
+            imap = linked_index_map(best_line, l)
+            xidx[j] = imap[xidx[best]] if imap is not None else nearest_index(l, xdpoint)[0]
+
+        dst.move_to_point(xdpoint, xidx=xidx)
 
     def add_linked(self, axes, x, y):
         marker = axes.marker_add(disp=(x,y))  
@@ -568,7 +1066,7 @@ class MarkerManager(object):
     def shift_linked(self, axes, direction):
         axes.marker_active.shift(direction)
         for ax in axes.marker_linked_axes:
-            ax.marker_active.move_to_point(xd=axes.marker_active.xdpoint)
+            self.follow_marker(axes.marker_active, ax.marker_active)
         
     def delete_linked(self, axes):
         new_marker = axes.marker_delete(axes.marker_active)
@@ -603,16 +1101,31 @@ class MarkerManager(object):
             self.draw_lm(axes)
             return
 
-        axes.figure.canvas.restore_region(axes._active_background)
-        if axes.marker_active != None:
-            axes.marker_active.draw()
-            axes.figure.canvas.blit(axes.bbox)
-        
-        for ax in axes.marker_linked_axes:
-            ax.figure.canvas.restore_region(ax._active_background)
-            if ax.marker_active != None:
-                ax.marker_active.draw()
-                ax.figure.canvas.blit(ax.bbox)
+        for ax in [axes] + axes.marker_linked_axes:
+            self.redraw_active_marker(ax)
+
+    def redraw_active_marker(self, ax):
+        """ erases the active marker of ax and draws it at its current location. If the canvas supports it, only
+            the region covered by the old and new marker is restored and blitted, instead of the full axes.
+        """
+        canvas = ax.figure.canvas
+        m = ax.marker_active
+        old = m.extents if m != None else None
+
+        if old == None or not partial_blit(canvas):
+            canvas.restore_region(ax._active_background)
+            if m != None:
+                m.draw()
+                canvas.blit(snap_bbox(ax.bbox, margin=0))
+            return
+
+        restore_damage(canvas, ax._active_background, old)
+        m.draw()
+
+        ax._marker_damage = union_extents(getattr(ax, '_marker_damage', None), m.extents)
+        damage = Bbox.intersection(union_extents(old, m.extents), snap_bbox(ax.bbox, margin=0))
+        if damage != None:
+            canvas.blit(damage)
 
 
     def get_event_marker(self, axes, event):
@@ -678,7 +1191,50 @@ class MarkerManager(object):
 
         if axes != self.move or axes.marker_active == None:
             return
-        
+
+        if self.max_fps == None:
+            self.move_linked(axes, x, y)
+            self.draw_active_marker(axes)
+            return
+
+        ## only keep the latest pointer position, and draw it once the frame interval has elapsed
+        self._pending_motion = (axes, x, y)
+        if self._motion_scheduled:
+            return
+
+        wait = 1/self.max_fps - (time() - self._last_motion)
+        if wait <= 0:
+            self.flush_motion()
+        else:
+            self.schedule_motion(wait)
+
+    def schedule_motion(self, wait):
+        """ draws the pending motion event after wait seconds, using the canvas timer so the draw happens on the 
+            gui thread
+        """
+        if self._motion_timer == None:
+            self._motion_timer = self.fig.canvas.new_timer()
+            self._motion_timer.single_shot = True
+            self._motion_timer.add_callback(self.flush_motion)
+
+        self._motion_scheduled = True
+        self._motion_timer.interval = max(int(wait*1000), 1)
+        self._motion_timer.start()
+
+    def flush_motion(self):
+        """ moves the active marker to the latest pending pointer position
+        """
+        self._motion_scheduled = False
+        if self._pending_motion == None:
+            return
+
+        axes, x, y = self._pending_motion
+        self._pending_motion = None
+        self._last_motion = time()
+
+        if axes.marker_active == None:
+            return
+
         self.move_linked(axes, x, y)
         self.draw_active_marker(axes)
 
@@ -695,6 +1251,8 @@ class MarkerManager(object):
     def onrelease(self, event):
         x = event.x
         y = event.y
+        ## draw any coalesced motion so a drag always ends on the last pointer position
+        self.flush_motion()
         axes = self.get_event_axes(event)
 
         self.move = None
@@ -732,17 +1290,111 @@ class MarkerManager(object):
                     vis.append(l)
 
         self.fig.canvas.draw()
+        self.render_count += 1
+        renderer = self.fig.canvas.get_renderer()
 
         for ax in self.fig.axes:
 
-            ax._all_background =  self.fig.canvas.copy_from_bbox(ax.bbox)
+            ax._all_background =  self.fig.canvas.copy_from_bbox(snap_bbox(ax.bbox, margin=0))
             ax._active_background = None
+            ax._lines_background = None
+            ## extents of the rendered decorations, cleared by update_axes_background() when they change
+            ax._tight_bbox = axes_extents(ax, renderer)
 
         for l in vis:
             l.set_visible(True)
 
         self.canvas_draw_connect()
 
+    def update_axes_background(self, axes):
+        """ generates a blank background image for axes and the axes that share its x-axis, without
+            rendering the rest of the figure. Falls back to update_background() if the canvas can't blit.
+            Returns the list of axes that were redrawn, including neighbouring axes that got a new background. Their
+            lines and markers must be redrawn with draw_lines_markers().
+        """
+        canvas = self.fig.canvas
+        if not getattr(canvas, 'supports_blit', True) or any(ax._all_background == None for ax in self.fig.axes):
+            self.update_background()
+            return self.fig.axes
+
+        renderer = canvas.get_renderer()
+        top = axes._top_axes
+
+        ## text extents include some padding, so ignore overlaps of a few pixels
+        tol = 2*(self.fig.dpi/100)
+        def overlaps(b1, b2):
+            b = Bbox.intersection(b1, b2)
+            return b != None and b.width > tol and b.height > tol
+
+        ## the extents of axes that are not redrawn are cached until the next full render
+        def tight_bbox(ax):
+            if getattr(ax, '_tight_bbox', None) == None:
+                ax._tight_bbox = axes_extents(ax, renderer)
+            return ax._tight_bbox
+
+        ## each axes of the group clears the union of its extents at the last render and its new extents, so 
+        ## decorations that shrank (i.e. narrower tick labels after new limits) don't leave old pixels behind.
+        ## Regions are snapped out to whole pixels, so edge pixels are cleared and redrawn completely.
+        group = list(top.get_shared_x_axes().get_siblings(top))
+        regions = []
+        for ax in group:
+            old = getattr(ax, '_tight_bbox', None)
+            ax._tight_bbox = None
+            regions.append(snap_bbox(union_extents(old, tight_bbox(ax)), self.fig.bbox))
+        regions = [r for r in regions if r != None]
+
+        ## other axes with decorations in the cleared regions are redrawn clipped to the regions, without
+        ## adding them to the group
+        neighbours = [ax for ax in self.fig.axes if ax not in group 
+                      and any(overlaps(tight_bbox(ax), r) for r in regions)]
+
+        ## neighbours with a cleared region inside their own bbox get a new background as well. Their old background is
+        ## restored first, so the lines and markers on the canvas don't end up in the new one.
+        touched = [ax for ax in neighbours if any(Bbox.intersection(ax.bbox, r) != None for r in regions)]
+        for ax in touched:
+            canvas.restore_region(ax._all_background)
+
+        vis = []
+        for ax in group + neighbours:
+            for l in ax.lines:
+                if l not in ax.marker_ignorelines and l.get_visible():
+                    l.set_visible(False)
+                    vis.append(l)
+
+        ## clear the regions with the figure background and redraw the figure artists on top, in figure draw order
+        for r in regions:
+            draw_clipped(self.fig.patch, renderer, r)
+
+        artists = [a for a in self.fig.get_children() if a is not self.fig.patch and not a.get_animated()]
+        artists = [a for a in artists if a in group or a in neighbours or a not in self.fig.axes]
+        for a in sorted(artists, key=lambda a: a.get_zorder()):
+            if a in group:
+                a.draw(renderer)
+                continue
+            for r in regions:
+                draw_clipped(a, renderer, r)
+
+        for ax in group + touched:
+            ax._all_background = canvas.copy_from_bbox(snap_bbox(ax.bbox, margin=0))
+            ax._active_background = None
+            ax._lines_background = None
+
+        for l in vis:
+            l.set_visible(True)
+
+        for r in regions:
+            canvas.blit(r)
+        return group + touched
+
+    def draw_axes(self, axes):
+        """ redraws the background, lines and markers of a single axes and its linked axes, leaving 
+            the rest of the figure untouched
+        """
+        group = self.update_axes_background(axes)
+        for ax in self.fig._top_axes:
+            if ax in group or ax in axes._top_axes.marker_linked_axes:
+                ax.draw_lines_markers()
+
     def draw_all(self, blit=True):
         self.update_background()
 
@@ -780,25 +1432,64 @@ class MarkerManager(object):
         diff = np.max(np.abs(old_origins - new_origins))
         return diff < error_threshold
 
+    def axes_positions(self):
+        """ returns the position of each figure axes in display coordinates
+        """
+        w, h = self.fig.bbox.width, self.fig.bbox.height
+        return np.array([ax.get_position().bounds for ax in self.fig.axes]) * [w, h, w, h]
+
+    def execute_layout(self):
+        """ runs the figure layout engine (constrained_layout or tight_layout) without rendering the figure.
+            Returns False if the figure has no automatic layout.
+        """
+        if hasattr(self.fig, 'get_layout_engine'):
+            engine = self.fig.get_layout_engine()
+            if engine == None:
+                return False
+            engine.execute(self.fig)
+
+        elif self.fig.get_constrained_layout():
+            self.fig.execute_constrained_layout(self.fig.canvas.get_renderer())
+
+        elif self.fig.get_tight_layout():
+            self.fig.tight_layout(**self.fig._tight_parameters)
+
+        else:
+            return False
+        return True
+
+    def settle_layout(self, max_iter=10, error_threshold=1):
+        """ repeats the layout pass until the axes positions stop moving, so the figure only needs to be 
+            rendered once with the final axes positions
+        """
+        positions = self.axes_positions()
+        for i in range(max_iter):
+            if not self.execute_layout():
+                return
+            new_positions = self.axes_positions()
+            if np.max(np.abs(new_positions - positions), initial=0) < error_threshold:
+                return
+            positions = new_positions
+
     def on_draw(self, event):
         ## if constrained_layout or automatic tight_layout is on, the axes may automatically move/resize 
         ## during the screen update and invalidate the text label positions
-        
-        ## draw until axes origin stops moving
+        renders = self.render_count
+
+        ## settle the axes positions before rendering the background
+        self.settle_layout()
+        self.update_all()
+        self.draw_all(blit=False)
+
+        ## fall back to redrawing if the render still moved the axes origin
         max_draw = 10
-        identical = False
-        draw = 0
-        while not identical:
-            identical = self.update_all()
+        draw = 1
+        while not self.update_all() and draw < max_draw:
             self.draw_all(blit=False)
-            
             draw += 1
-            if draw > max_draw:
-                break
-        
-        self.update_all()
+
         for ax in self.fig._top_axes:
             ax.draw_lines_markers(blit=False)
 
-
+        self.draw_event_renders = self.render_count - renders
 
@@ -1,10 +1,14 @@
 
-import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.artist import Artist
 from matplotlib.lines import Line2D
 from matplotlib.figure import Figure
-from . markers import MarkerManager, Marker
+from matplotlib.transforms import Bbox
+from . markers import MarkerManager, Marker, add_markers, set_marker_xdata
+from . markers import partial_blit, restore_damage, union_extents, snap_bbox
+from . decimate import decimated_line
+from . import readout
+from . streaming import LineStream
 from matplotlib import ticker
 
 import gorilla
@@ -28,12 +32,10 @@ def marker_add(self, xd=None, idx=None, disp=None, lines=None):
     """
     ax = self._top_axes
     if isinstance(xd, (list, tuple, np.ndarray)):
-        for x in xd:
-            ax.markers.append(Marker(ax, xd=x, lines=lines))
+        ax.markers += add_markers(ax, xd=xd, lines=lines)
     
     elif isinstance(idx, (list, tuple, np.ndarray)):
-        for i in idx:
-            ax.markers.append(Marker(ax, idx=i, lines=lines))
+        ax.markers += add_markers(ax, idx=idx, lines=lines)
     else:
         ax.markers.append(Marker(ax, xd=xd, idx=idx, disp=disp, lines=lines))
 
@@ -47,7 +49,12 @@ def marker_delete(self, marker):
     idx = ax.markers.index(marker)
     marker.remove()
     ax.markers.pop(idx)
-    return ax.markers[-1] if len(ax.markers) > 0 else None
+    new_marker = ax.markers[-1] if len(ax.markers) > 0 else None
+
+    ## the removed marker can't be drawn anymore
+    if ax.marker_active == marker:
+        ax.marker_active = new_marker
+    return new_marker
 
 def marker_delete_all(self):
     """ remove all markers from axes
@@ -67,8 +74,7 @@ def marker_set_params(self, **kwargs):
 def marker_ignore(self, *lines):
     """ flags lines that should not accept markers (i.e. axvlines)
     """
-    lines = list(lines)
-    self.marker_ignorelines += lines
+    self.marker_ignorelines.update(lines)
 
 def marker_link(self, *axes):
     """ --interactive only--
@@ -89,6 +95,36 @@ def marker_link(self, *axes):
         self._top_axes.marker_linked_axes.append(ax._top_axes)
         ax._top_axes.marker_linked_axes.append(self._top_axes)
 
+def marker_stream(self, line, capacity, max_fps=30, follow=True, autoscroll=False):
+    """ turns line into a streaming line with ring buffer backed data. New samples are added with the append 
+        method of the returned LineStream. Markers on the line are updated from the appended samples, and the axes
+        is redrawn by blitting at most max_fps times per second.
+
+        Parameters
+        ----------
+            line: (Line2D) line on this axes, existing line data is kept up to capacity samples
+            capacity: (int) number of samples shown on the line, older samples are dropped
+            max_fps: (float) maximum redraw rate, None to redraw after every append. All streaming lines of a figure
+                     share one redraw rate, the lowest max_fps of the streams on the figure.
+            follow: (bool) markers on the newest sample move to the newest sample on each append
+            autoscroll: (bool) shift the x-axis limits with the newest sample (ascending x-data only)
+
+        Returns
+        -------
+            LineStream
+    """
+    return LineStream(line, capacity, max_fps=max_fps, follow=follow, autoscroll=autoscroll)
+
+def marker_readout(self, fname=None):
+    """ returns the values of all markers on the axes as a structured array, with one row for each line of each marker.
+        See markerplot.readout.marker_readout for the array fields.
+
+        Parameters
+        ----------
+            fname: (str, Path) if provided, the readout is also saved to this file (.npy or csv)
+    """
+    return readout.marker_readout([self._top_axes], fname=fname)
+
 def _marker_yformat(self, xd, yd, mxd=None):
 
     yformatter = self.yaxis.get_major_formatter()
@@ -126,7 +162,7 @@ def plot(self, *args, **kwargs):
 
     if np.any(mxd):
         for l in lines:
-            l._marker_xdata = mxd
+            set_marker_xdata(l, mxd)
 
     return lines
 
@@ -136,47 +172,123 @@ def clear(self, *args, **kwargs):
     original = gorilla.get_original_attribute(self, 'clear')
     ret = original(*args, **kwargs)
 
+    ## axes created after marker_enable are cleared in Axes.__init__, before they have any marker attributes
+    if not hasattr(self, '_top_axes'):
+        return ret
+
     self.marker_delete_all()
-    self.marker_ignorelines = []
+    self.marker_ignorelines = set()
     self._active_background = None
+    self._lines_background = None
+    self._marker_damage = None
 
     return ret
 
+#####################
+## Line2D Patches  ##
+#####################
+
+def line_set_xdata(self, x):
+    # Patching Line2D set_xdata to bump the line x-version, so markers and the per-line caches 
+    # pick up the new data
+
+    original = gorilla.get_original_attribute(self, 'set_xdata')
+    ret = original(x)
+
+    self._marker_xversion = getattr(self, '_marker_xversion', 0) + 1
+    ## marker x-data follows the line x-data, unless it was set separately with marker_xd
+    if hasattr(self, '_marker_xdata') and not getattr(self, '_marker_xd_fixed', False):
+        self._marker_xdata = self.get_xdata()
+
+    return ret
+
+def line_set_ydata(self, y):
+    # Patching Line2D set_ydata to bump the line y-version
+
+    original = gorilla.get_original_attribute(self, 'set_ydata')
+    ret = original(y)
+
+    self._marker_yversion = getattr(self, '_marker_yversion', 0) + 1
+    return ret
+
 def draw_lines_markers(self, blit=True):
     """ Draws all lines and markers associated with axes onto canvas, and updates axes
-        background images used for blitting.
+        background images used for blitting. Data lines are drawn from a cached image unless
+        they have changed.
         Parameters
         ----------
             blit (bool): If True, drawn artists will be blitted onto canvas and the background
                          image will be updated. If False, the artists will be drawn but the canvas 
                          will not be updated.
     """
-    self.figure.canvas.restore_region(self._all_background)
-
-    for ax in self.axes.get_shared_x_axes().get_siblings(self):
-        for l in ax.lines:
-            if l not in ax.marker_ignorelines:
+    canvas = self.figure.canvas
+    ## saved regions cover the pixels on the edges of the axes that lines and markers are partly drawn on
+    bbox = snap_bbox(self.bbox, margin=0)
+    siblings = self.axes.get_shared_x_axes().get_siblings(self)
+    lines = [(ax, l) for ax in siblings for l in ax.lines if l not in ax.marker_ignorelines]
+
+    ## the background with data lines is cached, and redrawn only if the axes limits, the set of lines, 
+    ## or any line (data, visibility or style) has changed since it was drawn
+    ## hidden lines are skipped by Line2D.draw and stay stale, so only their visibility is part of the state
+    state = [tuple(self.bbox.bounds)] + [tuple(ax.viewLim.bounds) for ax in siblings]
+    state += [(id(l), l.get_visible()) for ax, l in lines]
+    stale = any(l.stale for ax, l in lines if l.get_visible())
+
+    ## if only markers changed, restore the lines layer where markers were drawn and blit just that region
+    old_damage = getattr(self, '_marker_damage', None)
+    partial = blit and partial_blit(canvas) and old_damage != None
+
+    if self._lines_background == None or stale or state != self._lines_state:
+        partial = False
+        canvas.restore_region(self._all_background)
+        for ax, l in lines:
+            if ax.marker_params['decimate']:
+                ax.draw_artist(decimated_line(ax, l))
+                ## the decimated copy stands in for the line, so the line is no longer stale
+                l.stale = False
+            else:
                 ax.draw_artist(l)
+        self._lines_background = canvas.copy_from_bbox(bbox)
+        self._lines_state = state
+    elif partial:
+        restore_damage(canvas, self._lines_background, old_damage)
+    else:
+        canvas.restore_region(self._lines_background)
     
     for m in self.markers:
         m.update_marker()
         if m != self.marker_active:
             m.draw()
 
-    if blit:
+    if blit and partial:
+        self._active_background = canvas.copy_from_bbox(bbox)
+        if self.marker_active != None:
+            self.marker_active.draw()
+
+        damage = union_extents(*[m.extents for m in self.markers])
+        damage = Bbox.intersection(union_extents(old_damage, damage), bbox)
+        if damage != None:
+            canvas.blit(damage)
 
-        self.figure.canvas.blit(self.bbox)
-        self._active_background = self.figure.canvas.copy_from_bbox(self.bbox)
+    elif blit:
+
+        self.figure.canvas.blit(bbox)
+        self._active_background = self.figure.canvas.copy_from_bbox(bbox)
 
         if self.marker_active != None:
             self.marker_active.draw()
 
-        self.figure.canvas.blit(self.bbox)
+        self.figure.canvas.blit(bbox)
     else:
         if self.marker_active != None:
             self.marker_active.draw()
         self._active_background = None
 
+    ## region of the axes covered by markers, restored on the next partial redraw
+    self._marker_damage = None
+    if partial_blit(canvas):
+        self._marker_damage = union_extents(*[m.extents for m in self.markers])
+
 
 ##############
 ############## 
@@ -195,13 +307,14 @@ marker_default_params = dict(
         ylabel_xpad = 10,
         ylabel_ypad = 4,
         inherit_ticker = True,
+        decimate = False,
     )
 
 ####################
 ## Figure Patches ##
 ####################
 
-def marker_enable(self, interactive=True, link_all=False, **marker_params):
+def marker_enable(self, interactive=True, link_all=False, max_fps=None, **marker_params):
     """ enable markers on all child axes of figure
 
         Parameters
@@ -211,6 +324,9 @@ def marker_enable(self, interactive=True, link_all=False, **marker_params):
             
             top_axes: (list of Axes) only used for shared axes created by plt.twinx().
                       axes in this list will be flagged as the interactive axes, any shared axes behind these will be non-interactive
+
+            max_fps: (float) --interactive only-- limits how often a dragged marker is redrawn. Motion events received
+                     between frames are coalesced, and only the latest pointer position is drawn.
             
             marker_params:  marker parameters to attach to all child axes, if parameters other than the defaults are needed.
                             If an axes needs unique parameters, use axes.marker_set_params() 
@@ -231,11 +347,15 @@ def marker_enable(self, interactive=True, link_all=False, **marker_params):
                     alpha: (float, 0-1) alpha value to apply to marker label text boxes
 
                     wrap: (bool) allow markers to wrap to other side of data array when using arrow keys
+
+                    decimate: (bool) --interactive only-- draw data lines with at most 4 points per pixel column when 
+                              redrawing markers. Marker values are always read from the full resolution data.
     """
+    self._marker_interactive = interactive
     if interactive:
         ## this will overwrite the reference to a previously defined event manager.
         ## as long as the user didn't store the old reference, the previous event bindings should be disconnected
-        self._eventmanager = MarkerManager(self)
+        self._eventmanager = MarkerManager(self, max_fps=max_fps)
 
     default_inst = dict(**marker_default_params)
     default_inst.update(dict(**marker_params))
@@ -243,11 +363,14 @@ def marker_enable(self, interactive=True, link_all=False, **marker_params):
     for ax in self.axes:
         ax.markers = []
         ax.marker_params = dict(**default_inst)
-        ax.marker_ignorelines = []
+        ax.marker_ignorelines = set()
         ax.marker_active = None
         ax.marker_linked_axes = []
         ax._active_background = None
         ax._all_background = None
+        ax._lines_background = None
+        ax._lines_state = None
+        ax._marker_damage = None
         ax._top_axes = ax
         
         if not hasattr(ax.__class__, 'marker_add'):
@@ -269,6 +392,12 @@ def marker_enable(self, interactive=True, link_all=False, **marker_params):
             patch = gorilla.Patch(ax.__class__, 'marker_link', marker_link)
             gorilla.apply(patch)
 
+            patch = gorilla.Patch(ax.__class__, 'marker_readout', marker_readout)
+            gorilla.apply(patch)
+
+            patch = gorilla.Patch(ax.__class__, 'marker_stream', marker_stream)
+            gorilla.apply(patch)
+
             patch = gorilla.Patch(ax.__class__, '_marker_xformat', _marker_xformat)
             gorilla.apply(patch)
 
@@ -322,6 +451,16 @@ def marker_enable(self, interactive=True, link_all=False, **marker_params):
         for ax in self._top_axes:
             ax.marker_link(*self._top_axes)
 
+def figure_marker_readout(self, fname=None):
+    """ returns the values of all markers on the figure as a structured array, with one row for each line of each marker.
+        See markerplot.readout.marker_readout for the array fields.
+
+        Parameters
+        ----------
+            fname: (str, Path) if provided, the readout is also saved to this file (.npy or csv)
+    """
+    return readout.marker_readout(self._top_axes, fname=fname)
+
 ##############
 ##############
 
@@ -330,4 +469,18 @@ def marker_enable(self, interactive=True, link_all=False, **marker_params):
 patch = gorilla.Patch(matplotlib.figure.Figure, 'marker_enable', marker_enable)
 gorilla.apply(patch)
 
+patch = gorilla.Patch(matplotlib.figure.Figure, 'marker_readout', figure_marker_readout)
+gorilla.apply(patch)
+
+## Line2D data hooks, Line2D.set_data calls both of these
+settings = gorilla.Settings(allow_hit=True, store_hit=True)
+patch = gorilla.Patch(Line2D, 'set_xdata', line_set_xdata, settings=settings)
+gorilla.apply(patch)
+
+patch = gorilla.Patch(Line2D, 'set_ydata', line_set_ydata, settings=settings)
+gorilla.apply(patch)
+
+patch = gorilla.Patch(Line2D, 'set_marker_xdata', set_marker_xdata)
+gorilla.apply(patch)
+
 
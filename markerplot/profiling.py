@@ -0,0 +1,272 @@
+import numpy as np
+import json
+import functools
+from collections import deque
+from time import perf_counter
+from matplotlib.transforms import Bbox
+from . import markers
+
+## profiler of the event that is currently being handled, stage timings are only recorded while this is set
+_active = None
+## number of enabled profilers, the shared stage hooks are removed when this drops to zero
+_enabled = 0
+
+_shared_originals = {}
+
+def _shared_stages():
+    """ returns (module or class, attribute, stage) of the stage functions that are shared by all figures
+    """
+    return (
+        (markers, 'nearest_index', 'search'),
+        (markers, 'nearest_index_polar', 'search'),
+        (markers, 'nearest_indices', 'search'),
+        (markers.Marker, 'find_nearest_xdpoint', 'search'),
+        (markers.Marker, 'space_labels', 'space_labels'),
+    )
+
+def _stage_hook(func, stage):
+    """ wraps func so the time spent in it is added to the given stage of the active event.
+        Nested calls of the same stage are only timed once.
+    """
+    @functools.wraps(func)
+    def hook(*args, **kwargs):
+        prof = _active
+        if prof is None or stage in prof._running:
+            return func(*args, **kwargs)
+
+        prof._running.add(stage)
+        t0 = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            prof._stage_times[stage] = prof._stage_times.get(stage, 0) + perf_counter() - t0
+            prof._running.discard(stage)
+    return hook
+
+def _install_shared():
+    for owner, name, stage in _shared_stages():
+        original = owner.__dict__[name]
+        _shared_originals[(owner, name)] = original
+        hook = _stage_hook(original, stage)
+        setattr(owner, name, hook)
+
+def _remove_shared():
+    for (owner, name), original in _shared_originals.items():
+        setattr(owner, name, original)
+    _shared_originals.clear()
+
+class EventProfiler(object):
+
+    events = ('onmotion', 'flush_motion', 'onclick', 'onrelease', 'onkey_press', 'on_draw')
+    stages = ('search', 'space_labels', 'draw', 'restore', 'blit', 'total')
+
+    ## histogram bin edges in seconds, log spaced from 1us to 10s with an underflow and overflow bin
+    edges = np.concatenate(([0], np.logspace(-6, 1, 71), [np.inf]))
+
+    def __init__(self, manager):
+        """ records stage timings (nearest search, space_labels, artist draw, background restore and blit)
+            for each event handled by a MarkerManager, aggregated into histograms per event and stage.
+
+            The profiler hooks into the manager only while enabled, a disabled profiler adds no
+            overhead to event handling.
+
+            Parameters
+            ----------
+                manager: (MarkerManager) event manager to profile
+        """
+        self.manager = manager
+        self.enabled = False
+        self.overlay = None
+
+        self._hooked = []
+        self._running = set()
+        self._stage_times = {}
+        ## end times of the last handled events, for the frame rate of the overlay
+        self._frames = deque(maxlen=30)
+        self.reset()
+
+    def reset(self):
+        """ clears all recorded timings
+        """
+        self.counts = {}
+        self.totals = {}
+        self.maxima = {}
+        self._frames.clear()
+
+    def enable(self, overlay=False):
+        """ start recording event timings
+
+            Parameters
+            ----------
+                overlay: (bool) if True, the frame rate and latency of the last event are drawn in the
+                         top left corner of the figure after each handled event
+        """
+        global _enabled
+        mgr = self.manager
+        fig = mgr.fig
+
+        if not self.enabled:
+            if _enabled == 0:
+                _install_shared()
+            _enabled += 1
+
+            ## instance attributes shadow the manager, canvas and axes methods, and are deleted in disable()
+            mgr.disconnect_events()
+            for name in self.events:
+                setattr(mgr, name, self._event_hook(name, getattr(mgr, name)))
+            mgr.connect_events()
+
+            self._hooked = [(fig.canvas, 'restore_region', 'restore'), (fig.canvas, 'blit', 'blit')]
+            self._hooked += [(ax, 'draw_artist', 'draw') for ax in fig.axes]
+            for obj, name, stage in self._hooked:
+                setattr(obj, name, _stage_hook(getattr(obj, name), stage))
+
+            self.enabled = True
+
+        if overlay and self.overlay == None:
+            self.overlay = fig.text(0.005, 0.995, self._overlay_text('', 0), ha='left', va='top', fontsize=8,
+                                    family='monospace', color='white', animated=True,
+                                    bbox=dict(boxstyle='square', facecolor='black', edgecolor='black'))
+        elif not overlay and self.overlay != None:
+            self.overlay.remove()
+            self.overlay = None
+
+    def disable(self):
+        """ stop recording event timings and remove the overlay. Recorded timings are kept until reset() is called.
+        """
+        global _enabled
+        if not self.enabled:
+            return
+        mgr = self.manager
+
+        mgr.disconnect_events()
+        for name in self.events:
+            del mgr.__dict__[name]
+        mgr.connect_events()
+
+        for obj, name, stage in self._hooked:
+            del obj.__dict__[name]
+        self._hooked = []
+
+        _enabled -= 1
+        if _enabled == 0:
+            _remove_shared()
+
+        if self.overlay != None:
+            self.overlay.remove()
+            self.overlay = None
+            mgr.fig.canvas.draw_idle()
+
+        self.enabled = False
+
+    def _event_hook(self, name, func):
+        @functools.wraps(func)
+        def hook(*args, **kwargs):
+            global _active
+            ## events handled inside another event (i.e. flush_motion from onmotion) belong to the outer event
+            if _active is not None:
+                return func(*args, **kwargs)
+
+            _active = self
+            self._stage_times = {}
+            t0 = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                total = perf_counter() - t0
+                _active = None
+                self._running.clear()
+                self.record(name, dict(self._stage_times, total=total))
+                if self.overlay != None:
+                    self.draw_overlay(name, total)
+        return hook
+
+    def record(self, event, times):
+        """ adds the stage times (dict of stage: seconds) of one event to the histograms
+        """
+        self._frames.append(perf_counter())
+        for stage, t in times.items():
+            key = (event, stage)
+            if key not in self.counts:
+                self.counts[key] = np.zeros(len(self.edges) - 1, dtype=int)
+                self.totals[key] = 0.0
+                self.maxima[key] = 0.0
+
+            self.counts[key][np.searchsorted(self.edges, t, side='right') - 1] += 1
+            self.totals[key] += t
+            self.maxima[key] = max(self.maxima[key], t)
+
+    def histogram(self, event, stage='total'):
+        """ returns the histogram (counts, edges) of the recorded times in seconds for an event and stage.
+            The first and last bins hold times below 1us and above 10s.
+        """
+        counts = self.counts.get((event, stage), np.zeros(len(self.edges) - 1, dtype=int))
+        return counts.copy(), self.edges.copy()
+
+    def percentile(self, event, stage='total', q=50):
+        """ returns the upper edge of the histogram bin that holds the q-th percentile of the recorded times
+        """
+        counts, edges = self.histogram(event, stage)
+        n = np.sum(counts)
+        if n < 1:
+            return np.nan
+        i = np.searchsorted(np.cumsum(counts), n*q/100)
+        return min(edges[i + 1], self.maxima[(event, stage)])
+
+    def fps(self):
+        """ returns the rate of handled events over the last 30 events, in events per second
+        """
+        if len(self._frames) < 2:
+            return 0.0
+        return (len(self._frames) - 1) / max(self._frames[-1] - self._frames[0], 1e-9)
+
+    def summary(self):
+        """ returns a dict of {event: {stage: dict(count, mean, max, p50, p90, p99)}}, times in seconds
+        """
+        summary = {}
+        for (event, stage), counts in self.counts.items():
+            n = int(np.sum(counts))
+            summary.setdefault(event, {})[stage] = dict(
+                count=n, mean=self.totals[(event, stage)]/n, max=self.maxima[(event, stage)],
+                p50=float(self.percentile(event, stage, 50)), p90=float(self.percentile(event, stage, 90)),
+                p99=float(self.percentile(event, stage, 99)))
+        return summary
+
+    def dump(self, fname=None):
+        """ returns a table of the recorded timings in milliseconds. If fname is provided, the summary and
+            histograms are also saved to the file as json.
+        """
+        lines = ['{:<14}{:<14}{:>8}{:>10}{:>10}{:>10}{:>10}'.format('event', 'stage', 'count', 'mean', 'p50', 'p90', 'max')]
+        summary = self.summary()
+        for event in self.events:
+            for stage in self.stages:
+                s = summary.get(event, {}).get(stage)
+                if s == None:
+                    continue
+                lines.append('{:<14}{:<14}{:>8}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}'.format(
+                    event, stage, s['count'], s['mean']*1e3, s['p50']*1e3, s['p90']*1e3, s['max']*1e3))
+
+        if fname != None:
+            hist = {'{}.{}'.format(*key): counts.tolist() for key, counts in self.counts.items()}
+            data = dict(summary=summary, edges=self.edges[1:-1].tolist(), histograms=hist)
+            with open(fname, 'w') as f:
+                json.dump(data, f, indent=1)
+
+        return '\n'.join(lines)
+
+    def _overlay_text(self, event, total):
+        return '{:5.1f} fps  {:<12} {:8.2f} ms'.format(self.fps(), event, total*1e3)
+
+    def draw_overlay(self, event, total):
+        """ draws the frame rate and latency of the last event over the figure and blits the overlay region
+        """
+        canvas = self.manager.fig.canvas
+        self.overlay.set_text(self._overlay_text(event, total))
+
+        renderer = canvas.get_renderer()
+        self.overlay.draw(renderer)
+        bbox = self.overlay.get_window_extent(renderer)
+        patch = self.overlay.get_bbox_patch()
+        if patch != None:
+            bbox = Bbox.union([bbox, patch.get_window_extent(renderer)])
+        canvas.blit(bbox.expanded(1.1, 1.1))
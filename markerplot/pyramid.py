@@ -0,0 +1,97 @@
+import numpy as np
+from . markers import line_version
+
+class MinMaxPyramid(object):
+
+    def __init__(self, y, block=64):
+        """ min/max pyramid (segment tree) over y-data, answers the y-range of any index range in O(log n).
+            Each level holds the nan-ignoring min and max of pairs of the level below, the lowest level holds
+            the min and max of blocks of samples. Infinite values are ignored like nan.
+
+            Parameters
+            ----------
+                y: (np.ndarray) y-data
+                block: (int) number of samples in each block of the lowest level. Partial blocks at the ends of
+                       a query range are reduced directly, so the query time is O(block + log n).
+        """
+        y = np.asarray(y, dtype=float)
+        self.y = np.where(np.isinf(y), np.nan, y) if np.isinf(y).any() else y
+        self.block = int(block)
+
+        starts = np.arange(0, len(self.y), self.block)
+        if len(starts):
+            mins, maxs = np.fmin.reduceat(self.y, starts), np.fmax.reduceat(self.y, starts)
+        else:
+            mins, maxs = np.empty(0), np.empty(0)
+
+        self.levels = [(mins, maxs)]
+        while len(mins) > 1:
+            if len(mins) % 2:
+                mins, maxs = np.append(mins, np.nan), np.append(maxs, np.nan)
+            mins, maxs = np.fmin(mins[0::2], mins[1::2]), np.fmax(maxs[0::2], maxs[1::2])
+            self.levels.append((mins, maxs))
+
+    def __len__(self):
+        return len(self.y)
+
+    def range(self, i0, i1):
+        """ returns (min, max) of y[i0:i1], ignoring nan and inf values. Both are nan if the range has no valid values.
+        """
+        i0, i1 = max(int(i0), 0), min(int(i1), len(self.y))
+        if i1 <= i0:
+            return np.nan, np.nan
+
+        b0, b1 = -(-i0 // self.block), i1 // self.block
+        if b1 <= b0:
+            return self._reduce(self.y[i0:i1])
+
+        ## partial blocks at the ends of the range
+        ymin, ymax = self._reduce(np.concatenate((self.y[i0:b0*self.block], self.y[b1*self.block:i1])))
+
+        ## full blocks, walking up the tree from both ends of the block range
+        for mins, maxs in self.levels:
+            if b1 <= b0:
+                break
+            if b0 % 2:
+                ymin, ymax = np.fmin(ymin, mins[b0]), np.fmax(ymax, maxs[b0])
+                b0 += 1
+            if b1 % 2:
+                b1 -= 1
+                ymin, ymax = np.fmin(ymin, mins[b1]), np.fmax(ymax, maxs[b1])
+            b0, b1 = b0 // 2, b1 // 2
+
+        return ymin, ymax
+
+    def _reduce(self, y):
+        if len(y) < 1 or np.all(np.isnan(y)):
+            return np.nan, np.nan
+        return np.nanmin(y), np.nanmax(y)
+
+def line_pyramid(l):
+    """ returns (x-data, pyramid) of line l. The pyramid is cached on the line and rebuilt only when the line
+        version changes. The x-data is None if it isn't ascending, the pyramid then only answers index ranges.
+    """
+    version = line_version(l)
+    cache = getattr(l, '_marker_pyramid', None)
+    if cache != None and cache[0] == version:
+        return cache[1], cache[2]
+
+    x = np.asarray(l.get_xdata())
+    if len(x) < 2 or not np.all(np.diff(x) >= 0):
+        x = None
+
+    pyramid = MinMaxPyramid(l.get_ydata())
+    l._marker_pyramid = (version, x, pyramid)
+    return x, pyramid
+
+def line_yrange(l, xmin=None, xmax=None):
+    """ returns (min, max) of the y-data of line l with x-data inside [xmin, xmax]. If the x-data of the line isn't
+        ascending, or xmin and xmax are None, the range of all y-data is returned.
+    """
+    x, pyramid = line_pyramid(l)
+    if x is None or xmin == None or xmax == None:
+        return pyramid.range(0, len(pyramid))
+
+    i0 = np.searchsorted(x, xmin, side='left')
+    i1 = np.searchsorted(x, xmax, side='right')
+    return pyramid.range(i0, i1)
@@ -0,0 +1,84 @@
+import numpy as np
+import csv
+from pathlib import Path
+
+def marker_readout(axes, fname=None):
+    """ returns the values of every marker on the given axes as a structured array, with one row for each
+        line of each marker. Values are gathered with one index operation per data line.
+
+        Parameters
+        ----------
+            axes: (list of Axes) axes with markers, markers on shared axes should be read from the top axes
+            fname: (str, Path) if provided, the readout is also saved to this file. Files ending with .npy are saved
+                   with np.save, all others are written as csv.
+
+        Returns
+        -------
+            structured np.ndarray with fields:
+                axes: (int) index of the marker axes in figure.axes
+                marker: (int) index of the marker in axes.markers
+                line: (str) line label
+                index: (int) data index of the marker on the line
+                x: (float) line x-data at index
+                y: (float) line y-data at index
+                marker_xd: (float) marker x-data at index (differs from x for lines plotted with marker_xd)
+                hidden: (bool) True if the marker is out of the line's x-data range or the y-value isn't finite
+    """
+    axes = list(axes)
+    fig = axes[0].figure if len(axes) else None
+
+    aid, mid, idx, hidden, lines = [], [], [], [], []
+    for ax in axes:
+        for i, m in enumerate(ax.markers):
+            n = len(m.lines)
+            aid.append(np.full(n, fig.axes.index(ax)))
+            mid.append(np.full(n, i))
+            idx.append(m.xidx)
+            hidden.append(np.isin(np.arange(n), m._hidden_markers))
+            lines += [l for ax_l, l in m.lines]
+
+    ## rows are grouped by line, so each line is indexed once for all markers
+    ulines = {id(l): l for l in lines}
+    width = max([len(l.get_label()) for l in ulines.values()] + [1])
+
+    dtype = [('axes', 'i4'), ('marker', 'i4'), ('line', 'U{}'.format(width)), ('index', 'i8'),
+             ('x', 'f8'), ('y', 'f8'), ('marker_xd', 'f8'), ('hidden', '?')]
+    data = np.zeros(len(lines), dtype=dtype)
+    if len(lines) < 1:
+        _save_readout(data, fname)
+        return data
+
+    data['axes'] = np.concatenate(aid)
+    data['marker'] = np.concatenate(mid)
+    data['index'] = np.concatenate(idx)
+    data['hidden'] = np.concatenate(hidden)
+
+    line_ids = np.array([id(l) for l in lines])
+    uids, inverse = np.unique(line_ids, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    splits = np.cumsum(np.bincount(inverse, minlength=len(uids)))[:-1]
+
+    for uid, rows in zip(uids, np.split(order, splits)):
+        l = ulines[uid]
+        i = data['index'][rows]
+        data['x'][rows] = np.real(np.asarray(l.get_xdata())[i])
+        data['y'][rows] = np.real(np.asarray(l.get_ydata())[i])
+        data['marker_xd'][rows] = np.real(np.asarray(l._marker_xdata)[i])
+        data['line'][rows] = l.get_label()
+
+    _save_readout(data, fname)
+    return data
+
+def _save_readout(data, fname):
+    if fname == None:
+        return
+
+    fname = Path(fname)
+    if fname.suffix == '.npy':
+        np.save(fname, data)
+        return
+
+    with open(fname, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(data.dtype.names)
+        writer.writerows(data.tolist())
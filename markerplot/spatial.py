@@ -0,0 +1,79 @@
+import numpy as np
+
+class DisplayGrid(object):
+
+    ## lines with fewer points than this are scanned directly
+    min_points = 2048
+    ## average number of points per grid cell
+    cell_points = 4
+
+    def __init__(self, xy):
+        """ uniform grid over line points in display coordinates, used to find the point nearest
+            to a display location (manhattan distance) without scanning the whole line.
+
+            Parameters
+            ----------
+                xy: (np.ndarray) Nx2 array of points in display coordinates. The grid keeps a reference
+                    to this array so callers can check whether the grid is still valid.
+        """
+        self.xy = xy
+        self.size = len(xy)
+
+        finite = np.flatnonzero(np.all(np.isfinite(xy), axis=1))
+        self.scan = self.size < self.min_points or len(finite) < 1
+        if self.scan:
+            return
+
+        px, py = xy[finite, 0], xy[finite, 1]
+        self.x0, self.y0 = np.min(px), np.min(py)
+        w = max(np.max(px) - self.x0, 1.0)
+        h = max(np.max(py) - self.y0, 1.0)
+
+        ncells = max(len(finite) / self.cell_points, 1)
+        self.h = np.sqrt(w*h/ncells)
+        self.nx = int(w/self.h) + 1
+        self.ny = int(h/self.h) + 1
+
+        cx = np.minimum(((px - self.x0)/self.h).astype(np.intp), self.nx-1)
+        cy = np.minimum(((py - self.y0)/self.h).astype(np.intp), self.ny-1)
+        cell = cy*self.nx + cx
+
+        ## sort points by cell, so each row of cells is a contiguous block of the sorted arrays
+        order = np.argsort(cell, kind='stable')
+        self.index = finite[order]
+        self.px = np.ascontiguousarray(px[order])
+        self.py = np.ascontiguousarray(py[order])
+        self.starts = np.searchsorted(cell[order], np.arange(self.nx*self.ny + 1))
+
+    def nearest(self, x, y):
+        """ returns the index and manhattan distance of the point nearest to (x, y)
+        """
+        if self.scan:
+            dist = np.abs(self.xy[:,0] - x) + np.abs(self.xy[:,1] - y)
+            idx = np.nanargmin(dist) if np.any(np.isfinite(dist)) else 0
+            return int(idx), dist[idx]
+
+        cx = int(min(max((x - self.x0)/self.h, 0), self.nx-1))
+        cy = int(min(max((y - self.y0)/self.h, 0), self.ny-1))
+
+        ## grow a square block of cells around (cx, cy) until no cell outside of it can hold a closer point.
+        ## points outside a block of radius r are at least r*h away from (x, y).
+        r = 1
+        while True:
+            x1, x2 = max(cx - r, 0), min(cx + r, self.nx-1)
+            y1, y2 = max(cy - r, 0), min(cy + r, self.ny-1)
+
+            rows = np.arange(y1, y2+1)*self.nx
+            starts, ends = self.starts[rows + x1], self.starts[rows + x2 + 1]
+            cand = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+
+            full = (x1 == 0) and (y1 == 0) and (x2 == self.nx-1) and (y2 == self.ny-1)
+            if len(cand):
+                dist = np.abs(self.px[cand] - x) + np.abs(self.py[cand] - y)
+                i = np.argmin(dist)
+                if full or dist[i] <= r*self.h:
+                    return int(self.index[cand[i]]), dist[i]
+            elif full:
+                return 0, np.inf
+
+            r *= 2
@@ -0,0 +1,275 @@
+import numpy as np
+from time import time
+from . markers import line_version, set_marker_xdata
+
+class RingBuffer(object):
+
+    def __init__(self, capacity, dtype=float):
+        """ fixed size sample buffer that drops the oldest samples when full. Samples are written twice,
+            so the buffer contents are always available as a single contiguous view without copying.
+
+            Parameters
+            ----------
+                capacity: (int) maximum number of samples
+                dtype: numpy dtype of the samples
+        """
+        self.capacity = int(capacity)
+        if self.capacity < 1:
+            raise ValueError('RingBuffer capacity must be at least 1')
+
+        self._data = np.zeros(2*self.capacity, dtype=dtype)
+        ## write position, and number of valid samples ending at the write position
+        self._end = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, values):
+        """ appends values to the buffer. Returns the number of old samples dropped from the start of the buffer.
+        """
+        values = np.ravel(values)
+        n = len(values)
+        dropped = max(self.size + n - self.capacity, 0)
+
+        values = values[-self.capacity:]
+        pos = (self._end + np.arange(len(values))) % self.capacity
+        self._data[pos] = values
+        self._data[pos + self.capacity] = values
+
+        self._end = (self._end + len(values)) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return dropped
+
+    def view(self):
+        """ returns the samples in the buffer, oldest first, as a view into the buffer memory
+        """
+        start = (self._end - self.size) % self.capacity
+        return self._data[start:start + self.size]
+
+class StreamRefresh(object):
+
+    def __init__(self, fig, max_fps=30):
+        """ redraws axes with streaming lines at a capped rate. Each refresh redraws the lines and markers
+            of the pending axes from their blitting backgrounds instead of rendering the whole figure.
+
+            Parameters
+            ----------
+                fig: (Figure) figure to refresh
+                max_fps: (float) maximum number of refreshes per second. If None, axes are redrawn on every request.
+        """
+        self.fig = fig
+        self.max_fps = max_fps
+        self.pending = []
+        self.pending_background = []
+        self.refresh_count = 0
+
+        self._last = 0
+        self._scheduled = False
+        self._timer = None
+
+    def request(self, axes, background=False):
+        """ schedules a redraw of axes. If background is True, the axes background (ticks, labels) is re-rendered
+            too, i.e. after the axes limits changed.
+        """
+        axes = getattr(axes, '_top_axes', axes)
+        if axes not in self.pending:
+            self.pending.append(axes)
+        if background and axes not in self.pending_background:
+            self.pending_background.append(axes)
+
+        if self._scheduled:
+            return
+
+        wait = 0 if self.max_fps == None else 1/self.max_fps - (time() - self._last)
+        if wait <= 0:
+            self.flush()
+            return
+
+        if self._timer == None:
+            self._timer = self.fig.canvas.new_timer()
+            self._timer.single_shot = True
+            self._timer.add_callback(self.flush)
+
+        self._scheduled = True
+        self._timer.interval = max(int(wait*1000), 1)
+        self._timer.start()
+
+    def flush(self):
+        """ redraws all pending axes
+        """
+        self._scheduled = False
+        self._last = time()
+        pending, background = self.pending, self.pending_background
+        self.pending, self.pending_background = [], []
+        if len(pending) < 1:
+            return
+
+        self.refresh_count += 1
+        mgr = getattr(self.fig, '_eventmanager', None)
+        ## without an event manager (non-interactive markers) or a rendered background there is nothing to blit on
+        if mgr == None or any(getattr(ax, '_all_background', None) == None for ax in pending):
+            self.fig.canvas.draw_idle()
+            return
+
+        for ax in pending:
+            if ax in background:
+                mgr.draw_axes(ax)
+            else:
+                ax.draw_lines_markers()
+
+class LineStream(object):
+
+    def __init__(self, line, capacity, max_fps=30, follow=True, autoscroll=False):
+        """ ring buffer backed data for a line that receives new samples over time, see axes.marker_stream()
+
+            Parameters
+            ----------
+                line: (Line2D) line to stream into. Existing line data is kept, up to capacity samples.
+                capacity: (int) number of samples shown on the line, older samples are dropped
+                max_fps: (float) maximum redraw rate of the axes, None to redraw after every append. Streams on the same 
+                         figure are redrawn together, at the lowest max_fps of the streams.
+                follow: (bool) markers placed on the newest sample move to the newest sample on each append.
+                        All other markers stay on their sample, or on the oldest sample once theirs is dropped.
+                autoscroll: (bool) shift the x-axis limits with the newest sample, keeping the current span visible.
+                            Only used for ascending x-data.
+        """
+        self.line = line
+        self.axes = line.axes
+        self.follow = follow
+        self.autoscroll = autoscroll
+
+        x, y = np.asarray(line.get_xdata()), np.asarray(line.get_ydata())
+        mxd = getattr(line, '_marker_xdata', None)
+
+        self.x = RingBuffer(capacity, dtype=np.result_type(x, float))
+        self.y = RingBuffer(capacity, dtype=np.result_type(y, float))
+        ## lines plotted with marker_xd keep their marker x-data in a third buffer
+        self.mxd = None
+        if mxd is not None and mxd is not line.get_xdata():
+            self.mxd = RingBuffer(capacity, dtype=np.result_type(mxd, float))
+            self.mxd.append(mxd)
+
+        self.x.append(x)
+        self.y.append(y)
+        xd = self.marker_xdata()
+        self.ascending = len(xd) < 2 or bool(np.all(np.diff(xd) > 0))
+        self.bounds = (np.nanmin(xd), np.nanmax(xd)) if len(xd) else (np.nan, np.nan)
+
+        fig = self.axes.figure
+        if getattr(fig, '_marker_stream_refresh', None) == None:
+            fig._marker_stream_refresh = StreamRefresh(fig, max_fps)
+        self.refresh = fig._marker_stream_refresh
+        ## keep the strictest cap of all streams on the figure
+        if max_fps != None:
+            self.refresh.max_fps = max_fps if self.refresh.max_fps == None else min(self.refresh.max_fps, max_fps)
+
+        line._marker_stream = self
+        self.update_line()
+
+    def __len__(self):
+        return len(self.x)
+
+    def marker_xdata(self):
+        return self.x.view() if self.mxd == None else self.mxd.view()
+
+    def update_line(self):
+        l = self.line
+        l.set_data(self.x.view(), self.y.view())
+        if self.mxd == None:
+            l._marker_xdata = l.get_xdata()
+        else:
+            set_marker_xdata(l, self.mxd.view().copy())
+
+        ## the stream already knows the order and bounds of the new data, so seed the search table and
+        ## bounds caches for the new line version instead of checking the data again
+        version = line_version(l)[0]
+        l._marker_xbounds = (version, self.bounds)
+        if self.ascending:
+            xd = np.asarray(l._marker_xdata)
+            l._marker_xsearch = (version, xd, xd, 1)
+
+    def append(self, x, y, mxd=None):
+        """ appends samples to the line, updates the markers on the line and schedules a redraw of the axes
+
+            Parameters
+            ----------
+                x, y: (float, np.ndarray) new samples
+                mxd: (float, np.ndarray) new marker x-data, required if the line was plotted with marker_xd
+        """
+        x, y = np.ravel(x), np.ravel(y)
+        if len(x) != len(y):
+            raise ValueError('x and y must have the same length')
+        if len(x) < 1:
+            return
+        if self.mxd != None and mxd is None:
+            raise ValueError('mxd must be provided for lines plotted with marker_xd')
+
+        chunk = x if self.mxd == None else np.ravel(mxd)
+        old_size = len(self)
+        last = self.marker_xdata()[-1] if old_size else -np.inf
+
+        dropped = self.x.append(x)
+        self.y.append(y)
+        if self.mxd != None:
+            self.mxd.append(chunk)
+
+        self.ascending = self.ascending and chunk[0] > last and bool(np.all(np.diff(chunk) > 0))
+        self.update_bounds(chunk, dropped)
+        self.update_line()
+        self.update_markers(old_size, dropped)
+
+        background = False
+        if self.autoscroll and self.ascending and self.mxd == None:
+            x0, x1 = self.axes.get_xlim()
+            span = abs(x1 - x0)
+            if x[-1] > max(x0, x1):
+                self.axes.set_xlim((x[-1] - span, x[-1]) if x1 > x0 else (x[-1], x[-1] - span))
+                background = True
+
+        self.refresh.request(self.axes, background=background)
+
+    def update_bounds(self, chunk, dropped):
+        xd = self.marker_xdata()
+        if self.ascending:
+            self.bounds = (xd[0], xd[-1])
+        elif dropped == 0:
+            self.bounds = (np.nanmin(np.append(chunk, self.bounds[0])), np.nanmax(np.append(chunk, self.bounds[1])))
+        else:
+            self.bounds = (np.nanmin(xd), np.nanmax(xd))
+
+    def markers(self):
+        """ returns a list of (marker, line index) for each marker placed on the line
+        """
+        found = []
+        for ax in self.axes.figure.axes:
+            for m in getattr(ax, 'markers', []):
+                for i, (m_ax, l) in enumerate(m.lines):
+                    if l is self.line:
+                        found.append((m, i))
+        return found
+
+    def update_markers(self, old_size, dropped):
+        """ shifts the marker indices on the line by the number of dropped samples, and updates the marker
+            labels without searching the line data.
+        """
+        size = len(self)
+        for m, i in self.markers():
+            ## indices on the other lines of the marker are not shifted by this line, so the marker can't
+            ## keep sharing one index between its lines
+            m.index_mode = False
+
+            xidx = m.xidx[i]
+            if self.follow and xidx == old_size - 1:
+                xidx = size - 1
+            else:
+                xidx = max(xidx - dropped, 0)
+
+            if xidx == m.xidx[i] and dropped == 0:
+                continue
+
+            m.xidx[i] = xidx
+            xdpoint = m.xdpoint
+            if i == 0 or len(m.lines) == 1:
+                xdpoint = self.line._marker_xdata[xidx]
+            m.move_to_point(xdpoint, xidx=m.xidx)
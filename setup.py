@@ -11,8 +11,8 @@ setup(
 		'matplotlib>=3.1.3',
         'numpy',
         'gorilla',
-        'pyside2',
-        'Pillow',
-        'pywin32'
     ),
+    extras_require={
+        'interactive': ['pyside2'],
+    },
 )
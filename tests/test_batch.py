@@ -0,0 +1,24 @@
+import numpy as np
+
+from markerplot.batch import render_job
+
+def test_render_job_vector_output(tmp_path):
+    x = np.linspace(0, 10, 100)
+    svg = []
+    for markers in (None, [3]):
+        fname = tmp_path / 'job.svg'
+        result = render_job([(x, np.sin(x))], markers=markers, fname=fname)
+        assert result['error'] == None
+        svg.append(fname.read_text())
+
+    ## the marker adds its vertical line, dot and the label text with its box
+    assert svg[1].count('id="line2d_') == svg[0].count('id="line2d_') + 2
+    assert svg[1].count('id="text_') == svg[0].count('id="text_') + 1
+    assert svg[1].count('id="patch_') == svg[0].count('id="patch_') + 1
+
+def test_render_job_pdf(tmp_path):
+    x = np.linspace(0, 10, 100)
+    fname = tmp_path / 'job.pdf'
+    result = render_job([(x, np.sin(x))], markers=[3, 6], fname=fname, marker_params=dict(show_xlabel=True))
+    assert result['error'] == None
+    assert fname.read_bytes().startswith(b'%PDF')
@@ -0,0 +1,120 @@
+import contextlib
+from types import SimpleNamespace as NS
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+
+import markerplot
+from markerplot import markers, patches
+
+def event(x, y, ax, key=None):
+    return NS(x=x, y=y, inaxes=ax, key=key)
+
+def marker_session():
+    """ places, drags, shifts and deletes markers on a linked figure, and returns the canvas buffer after each event
+    """
+    fig, (a1, a2) = plt.subplots(2, 1, figsize=(8, 6))
+    fig.canvas.toolbar = NS(mode='', _wait_cursor_for_draw_cm=contextlib.nullcontext)
+    fig.marker_enable(interactive=True, link_all=True, show_xlabel=True)
+    x = np.linspace(0, 10, 2001)
+    a1.plot(x, np.sin(x))
+    a1.plot(x, np.cos(x))
+    a2.plot(x, np.sin(3*x))
+    fig.canvas.draw()
+    mgr = fig._eventmanager
+
+    buffers = []
+    def record():
+        buffers.append(np.asarray(fig.canvas.buffer_rgba()).copy())
+
+    mgr.onrelease(event(200, 400, a1))
+    record()
+    mgr.shift_is_held = True
+    mgr.onrelease(event(400, 400, a1))
+    mgr.shift_is_held = False
+    record()
+
+    mgr.onclick(event(400, 400, a1))
+    for px in range(400, 600, 7):
+        mgr.onmotion(event(px, 400, a1))
+        record()
+    mgr.onrelease(event(600, 400, a1))
+
+    for i in range(5):
+        mgr.onkey_press(event(0, 0, a1, key='left'))
+        record()
+
+    mgr.onclick(event(200, 400, a1))
+    mgr.onrelease(event(200, 400, a1))
+    record()
+    mgr.onkey_press(event(0, 0, a1, key='delete'))
+    record()
+
+    plt.close(fig)
+    return buffers
+
+def test_partial_blit_matches_full_blit(monkeypatch):
+    partial = marker_session()
+
+    monkeypatch.setattr(markers, 'partial_blit', lambda canvas: False)
+    monkeypatch.setattr(patches, 'partial_blit', lambda canvas: False)
+    full = marker_session()
+
+    assert len(partial) == len(full)
+    for p, f in zip(partial, full):
+        assert np.array_equal(p, f)
+
+def test_marker_extents_cover_artists():
+    fig, ax = plt.subplots()
+    x = np.linspace(0, 10, 200)
+    ax.plot(x, np.sin(x))
+    fig.marker_enable(interactive=True, show_xlabel=True)
+    fig.canvas.draw()
+    ax.marker_add(xd=4)
+    ax.draw_lines_markers()
+
+    m = ax.marker_active
+    renderer = fig.canvas.get_renderer()
+    m.set_visible(True)
+    for a in [m.xtext] + m.ytext + m.ydot:
+        b = a.get_window_extent(renderer)
+        assert m.extents.x0 <= b.x0 and m.extents.x1 >= b.x1
+        assert m.extents.y0 <= b.y0 and m.extents.y1 >= b.y1
+    m.set_visible(False)
+    plt.close(fig)
+
+@pytest.mark.parametrize('ylim', [False, True])
+def test_draw_axes_matches_full_draw(ylim):
+    fig, axs = plt.subplots(3, 3, figsize=(8, 6))
+    x = np.linspace(0, 10, 200)
+    for i, ax in enumerate(axs.flat):
+        ax.plot(x, np.sin(x))
+        ax.set_title('axes {}'.format(i))
+    fig.suptitle('grid')
+    fig.marker_enable(interactive=True)
+    fig.canvas.draw()
+    for ax in axs.flat:
+        ax.marker_add(xd=4)
+    fig.canvas.draw()
+    mgr = fig._eventmanager
+
+    ## only the axes and the neighbours its decorations overlap are redrawn
+    ax = axs[1, 1]
+    group = mgr.update_axes_background(ax)
+    assert ax in group and len(group) < 4
+    for a in group:
+        a.draw_lines_markers()
+
+    ## repeated partial redraws must not build up on the pixels at the edges of the redrawn region, and
+    ## must restore the decorations of neighbouring axes in the region
+    for k in range(6):
+        if ylim:
+            ax.set_ylim(-1 - 0.3*k, 1)
+        mgr.draw_axes(ax)
+
+    part = np.asarray(fig.canvas.buffer_rgba()).copy()
+    fig.canvas.draw()
+    full = np.asarray(fig.canvas.buffer_rgba())
+    assert np.array_equal(part, full)
+    plt.close(fig)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from markerplot.decimate import minmax_decimate
+
+def column_envelopes(x, y, idx, xmin, xmax, width):
+    """ returns {pixel column: (first index, last index, nan-ignoring min, max)} of the points idx, plus the range of
+        points that is decimated (one point outside each side of the visible range)
+    """
+    i0 = max(np.searchsorted(x, xmin) - 1, 0)
+    i1 = min(np.searchsorted(x, xmax, side='right') + 1, len(x))
+    idx = np.asarray(idx)
+    idx = idx[(idx >= i0) & (idx < i1)]
+
+    col = np.clip(np.floor((x[idx] - xmin) * width/(xmax - xmin)), -1, width).astype(int)
+    envelopes = {}
+    for c in np.unique(col):
+        i = idx[col == c]
+        ys = y[i]
+        lo, hi = (np.nanmin(ys), np.nanmax(ys)) if not np.all(np.isnan(ys)) else (np.nan, np.nan)
+        envelopes[c] = (i[0], i[-1], lo, hi)
+    return envelopes, (i0, i1)
+
+def test_decimate_keeps_column_envelope():
+    rng = np.random.default_rng(0)
+    for trial in range(50):
+        n = rng.integers(500, 20000)
+        x = np.cumsum(rng.uniform(0, 1, n))
+        y = rng.normal(size=n)
+        y[rng.random(n) < 0.02] = np.nan
+        xmin, xmax = np.sort(rng.uniform(x[0] - 10, x[-1] + 10, 2))
+        width = int(rng.integers(10, 200))
+
+        idx = minmax_decimate(x, y, xmin, xmax, width)
+        full, (i0, i1) = column_envelopes(x, y, np.arange(len(x)), xmin, xmax, width)
+        if i1 - i0 <= 4*width:
+            ## ranges with few points are returned as they are
+            assert np.array_equal(idx, np.arange(i0, i1))
+            continue
+
+        ## the decimated line is an approximation of the full line, but each pixel column keeps the points
+        ## where the line enters and leaves it, and its min/max envelope
+        assert np.all(np.diff(idx) > 0)
+        assert len(idx) <= 4*(width + 2)
+        decimated, _ = column_envelopes(x, y, idx, xmin, xmax, width)
+        assert decimated.keys() == full.keys()
+        for c, (first, last, lo, hi) in full.items():
+            d_first, d_last, d_lo, d_hi = decimated[c]
+            assert (d_first, d_last) == (first, last)
+            np.testing.assert_array_equal([d_lo, d_hi], [lo, hi])
+
+def test_decimate_keeps_extremes():
+    x = np.arange(100000, dtype=float)
+    y = np.sin(x/1000)
+    y[12345], y[67890] = 5, -5
+    idx = minmax_decimate(x, y, 0, 99999, 100)
+    assert len(idx) <= 4*100 + 2
+    assert 12345 in idx and 67890 in idx
+    assert np.nanmax(y[idx]) == 5 and np.nanmin(y[idx]) == -5
@@ -0,0 +1,79 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+import pytest
+
+QtWidgets = pytest.importorskip('PySide2.QtWidgets')
+from PySide2.QtCore import Qt
+
+from markerplot import interactive
+
+@pytest.fixture(scope='module')
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def window(qapp):
+    fig, ax = interactive.interactive_subplots(autoscale=True)
+    x = np.linspace(0, 10, 1001)
+    for i in range(300):
+        ax.plot(x, x*i, label='trace{}'.format(i))
+    ax.plot(x, -x, label='$S_{21}$')
+    win = fig.app
+    win.update_traces_group(remove=False)
+    yield win, ax
+    win.close()
+
+def test_trace_filter_and_all(window):
+    win, ax = window
+    panel = win.traces[0]
+    assert panel.model.rowCount() == 301
+    assert panel.cb_all.checkState() == Qt.Checked
+
+    panel.search.setText('TRACE29')
+    assert panel.filtered_rows() == [29] + list(range(290, 300))
+
+    panel.cb_all.setCheckState(Qt.Unchecked)
+    hidden = [l for l in ax.lines if not l.get_visible()]
+    assert len(hidden) == 11 and all(l.get_label() == '' for l in hidden)
+
+    panel.search.setText('')
+    assert panel.cb_all.checkState() == Qt.PartiallyChecked
+
+    panel.cb_all.setCheckState(Qt.Checked)
+    assert all(l.get_visible() for l in ax.lines)
+    assert ax.lines[29].get_label() == 'trace29'
+
+def test_trace_row_toggle(window):
+    win, ax = window
+    panel = win.traces[0]
+    index = panel.proxy.index(0, 0)
+    panel.proxy.setData(index, Qt.Unchecked, Qt.CheckStateRole)
+    assert not ax.lines[0].get_visible()
+    assert panel.proxy.data(index, Qt.CheckStateRole) == Qt.Unchecked
+
+def test_autoscale_follows_zoom(window):
+    win, ax = window
+    ax.set_xlim(1, 2)
+    ymin, ymax = ax.get_ylim()
+    pad = (2*299 + 2)/20
+    assert np.isclose(ymin, -2 - pad) and np.isclose(ymax, 2*299 + pad)
+
+def test_mathtext_labels(window):
+    win, ax = window
+    view = win.traces[0].view
+    delegate = view.itemDelegate()
+
+    option = QtWidgets.QStyleOptionViewItem()
+    option.initFrom(view)
+    assert delegate.label_pixmap('trace0', option) is None
+
+    pixmap = delegate.label_pixmap('$S_{21}$', option)
+    assert pixmap is not None and not pixmap.isNull()
+    ## pixmaps are rendered once per label
+    assert delegate.label_pixmap('$S_{21}$', option) is pixmap
+
+    view.resize(200, 400)
+    view.scrollToBottom()
+    assert not view.grab().isNull()
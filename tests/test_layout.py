@@ -0,0 +1,50 @@
+import numpy as np
+
+from markerplot.layout import spread_intervals
+
+def random_intervals(rng, n):
+    lower = np.sort(rng.uniform(0, 100, n))
+    height = rng.uniform(1, 10, n)
+    return np.column_stack((lower, lower + height))
+
+def brute_spread(loc_array):
+    """ least squares non-overlapping centers without bounds, from the min-max formula of isotonic regression
+    """
+    height = loc_array[:,1] - loc_array[:,0]
+    center = loc_array.mean(axis=1)
+    offset = np.concatenate(([0], np.cumsum((height[:-1] + height[1:])/2)))
+    target = center - offset
+
+    n = len(target)
+    z = np.array([max(min(np.mean(target[j:k+1]) for k in range(i, n)) for j in range(i+1)) for i in range(n)])
+    center = z + offset
+    return np.column_stack((center - height/2, center + height/2))
+
+def test_spread_matches_least_squares():
+    rng = np.random.default_rng(0)
+    for trial in range(100):
+        loc = random_intervals(rng, rng.integers(1, 25))
+        out = spread_intervals(loc, -np.inf, np.inf)
+        assert np.allclose(out, brute_spread(loc))
+
+def test_spread_no_overlap_inside_bounds():
+    rng = np.random.default_rng(1)
+    for trial in range(100):
+        loc = random_intervals(rng, rng.integers(1, 25))
+        height = loc[:,1] - loc[:,0]
+        ymin, ymax = 0, max(110, np.sum(height))
+        out = spread_intervals(loc, ymin, ymax)
+
+        assert np.allclose(out[:,1] - out[:,0], height)
+        assert np.all(out[1:,0] >= out[:-1,1] - 1e-9)
+        assert out[0,0] >= ymin - 1e-9 and out[-1,1] <= ymax + 1e-9
+
+def test_spread_too_tall_keeps_lowest_inside():
+    loc = np.array([[0, 10], [5, 15], [8, 18]], dtype=float)
+    out = spread_intervals(loc, 0, 20)
+    assert np.isclose(out[0,0], 0)
+    assert np.all(out[1:,0] >= out[:-1,1] - 1e-9)
+
+def test_spread_separated_intervals_unchanged():
+    loc = np.array([[0, 1], [2, 3], [10, 12]], dtype=float)
+    assert np.allclose(spread_intervals(loc, -10, 20), loc)
@@ -0,0 +1,149 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.lines import Line2D
+
+import markerplot
+from markerplot.markers import nearest_index, nearest_index_polar, set_marker_xdata
+
+def make_line(x):
+    l = Line2D(x, np.zeros(len(x)))
+    set_marker_xdata(l, np.asarray(x))
+    return l
+
+def brute_nearest(x, xd):
+    dist = np.abs(x - xd)
+    idx = np.argmin(dist)
+    return int(idx), dist[idx]
+
+@pytest.mark.parametrize('order', ['ascending', 'descending', 'random'])
+def test_nearest_index(order):
+    rng = np.random.default_rng(0)
+    for trial in range(50):
+        x = np.unique(rng.integers(-500, 500, rng.integers(1, 200))).astype(float)
+        if order == 'descending':
+            x = x[::-1]
+        elif order == 'random':
+            x = rng.permutation(np.repeat(x, 2))
+        l = make_line(x)
+
+        ## integer and half-integer queries hit exact samples and ties between samples
+        for xd in np.concatenate((rng.integers(-600, 600, 20), rng.integers(-600, 600, 20) + 0.5)):
+            assert nearest_index(l, xd) == brute_nearest(x, xd)
+
+def test_nearest_index_new_data():
+    l = make_line(np.arange(10.0))
+    assert nearest_index(l, 3.2)[0] == 3
+
+    set_marker_xdata(l, np.arange(10.0)[::-1])
+    assert nearest_index(l, 3.2)[0] == 6
+
+def brute_nearest_polar(x, xd):
+    d = np.abs(x - xd)
+    dist = np.minimum(d, np.minimum(np.abs(d - 2*np.pi), np.abs(d + 2*np.pi)))
+    idx = np.argmin(dist)
+    return int(idx), dist[idx]
+
+@pytest.mark.parametrize('order', ['ascending', 'descending', 'random'])
+def test_nearest_index_polar(order):
+    rng = np.random.default_rng(1)
+    for trial in range(50):
+        x = np.unique(rng.uniform(-np.pi, np.pi, rng.integers(1, 200)))
+        if order == 'descending':
+            x = x[::-1]
+        elif order == 'random':
+            x = rng.permutation(x)
+        l = make_line(x)
+
+        for xd in rng.uniform(-np.pi, np.pi, 40):
+            idx, dist = nearest_index_polar(l, xd)
+            bidx, bdist = brute_nearest_polar(x, xd)
+            assert np.isclose(dist, bdist)
+            assert np.isclose(brute_nearest_polar(x[idx:idx+1], xd)[1], bdist)
+
+def test_nearest_index_polar_wraps():
+    l = make_line(np.linspace(-np.pi, np.pi*0.9, 50))
+    assert nearest_index_polar(l, np.pi)[0] == 0
+
+def test_marker_follows_new_line_data():
+    fig, (a1, a2) = plt.subplots(2, 1)
+    fig.marker_enable(interactive=True, link_all=True)
+    x = np.linspace(0, 10, 101)
+    l1, l1b = a1.plot(x, np.sin(x), x, np.cos(x))
+    l2, = a2.plot(x, np.cos(x))
+    fig.canvas.draw()
+    m1, m2 = a1.marker_add(xd=3), a2.marker_add(xd=3)
+    assert m1.index_mode and m1.xidx == [30, 30]
+
+    ## same grid on every line: the marker keeps its index, and its x-location follows the new x-data
+    l1.set_xdata(x + 1)
+    l1b.set_xdata(x + 1)
+    m1.check_lines()
+    assert m1.index_mode and m1.xidx == [30, 30] and m1.xdpoint == 4
+
+    ## lines on different grids: each line is placed on its sample nearest to the marker x-location
+    l1.set_data(x/2, np.sin(x))
+    fig._eventmanager.follow_marker(m1, m2)
+    assert not m1.index_mode
+    assert m1.xdpoint == 4 and m1.xidx == [80, 30]
+    assert m2.xdpoint == 4 and m2.xidx == [40]
+    plt.close(fig)
+
+def test_follow_marker_matches_move_to_point():
+    rng = np.random.default_rng(2)
+    fig, (a1, a2) = plt.subplots(2, 1)
+    fig.marker_enable(interactive=True, link_all=True)
+    x = np.sort(rng.uniform(0, 10, 300))
+    a1.plot(x, np.sin(x))
+    a1.plot(x[::3], np.cos(x[::3]))
+    ## linked lines on other grids, one of them shorter than the source lines
+    a2.plot(np.linspace(0, 10, 77), np.zeros(77))
+    a2.plot(np.sort(rng.uniform(2, 8, 150)), np.ones(150))
+    fig.canvas.draw()
+
+    src, dst, ref = a1.marker_add(xd=5), a2.marker_add(xd=5), a2.marker_add(xd=5)
+    mgr = fig._eventmanager
+    for xd in rng.uniform(-1, 11, 100):
+        src.move_to_point(xd=xd, layout=False)
+        mgr.follow_marker(src, dst)
+        ref.move_to_point(xd=src.xdpoint, layout=False)
+        assert dst.xdpoint == ref.xdpoint
+        assert dst.xidx == ref.xidx
+        assert sorted(dst._hidden_markers) == sorted(ref._hidden_markers)
+    plt.close(fig)
+
+@pytest.mark.parametrize('grid', ['same', 'different', 'non-monotonic'])
+def test_batched_add_matches_single_adds(grid):
+    rng = np.random.default_rng(3)
+    x = np.linspace(0, 10, 201)
+    if grid == 'same':
+        lines = [(x, np.sin(x)), (x, np.cos(x))]
+    elif grid == 'different':
+        x2 = np.sort(rng.uniform(2, 8, 120))
+        lines = [(x, np.sin(x)), (x2, np.cos(x2))]
+    else:
+        x2 = rng.permutation(x)
+        lines = [(x, np.sin(x)), (x2, np.cos(x2))]
+    ## nan samples hide the marker on a line, like x-locations outside of the line x-range
+    lines[1][1][::7] = np.nan
+
+    fig, ax = plt.subplots()
+    for xl, yl in lines:
+        ax.plot(xl, yl)
+    fig.marker_enable(interactive=True)
+    fig.canvas.draw()
+
+    xd = np.concatenate((rng.uniform(-1, 11, 40), x[::25]))
+    ax.marker_add(xd=xd)
+    batched = list(ax.markers)
+    for v in xd:
+        ax.marker_add(xd=v)
+    single = ax.markers[len(batched):]
+
+    assert len(batched) == len(single) == len(xd)
+    for b, m in zip(batched, single):
+        assert b.index_mode == m.index_mode
+        assert b.xdpoint == m.xdpoint
+        assert list(b.xidx) == list(m.xidx)
+        assert sorted(b._hidden_markers) == sorted(m._hidden_markers)
+    plt.close(fig)
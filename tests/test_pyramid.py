@@ -0,0 +1,45 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+import markerplot
+from markerplot.pyramid import MinMaxPyramid, line_yrange
+
+def brute_range(y, i0, i1):
+    y = np.where(np.isinf(y), np.nan, y)[max(i0, 0):max(i1, 0)]
+    if len(y) < 1 or np.all(np.isnan(y)):
+        return np.nan, np.nan
+    return np.nanmin(y), np.nanmax(y)
+
+def test_range_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        n = int(rng.integers(0, 3000))
+        y = rng.normal(size=n)
+        y[rng.random(n) < 0.05] = np.nan
+        y[rng.random(n) < 0.01] = np.inf
+        pyramid = MinMaxPyramid(y, block=int(rng.integers(1, 70)))
+
+        for q in range(20):
+            i0, i1 = np.sort(rng.integers(-5, n + 5, 2))
+            assert np.array_equal(pyramid.range(i0, i1), brute_range(y, i0, i1), equal_nan=True)
+
+def test_range_all_nan():
+    pyramid = MinMaxPyramid(np.full(1000, np.nan), block=8)
+    assert np.all(np.isnan(pyramid.range(0, 1000)))
+
+def test_line_yrange():
+    fig, ax = plt.subplots()
+    x = np.linspace(0, 10, 10001)
+    l, = ax.plot(x, x**2)
+
+    assert np.allclose(line_yrange(l), (0, 100))
+    assert np.allclose(line_yrange(l, 2, 3), (4, 9))
+
+    ## the cached pyramid is rebuilt for new line data
+    l.set_ydata(-x)
+    assert np.allclose(line_yrange(l, 2, 3), (-3, -2))
+
+    ## unordered x-data falls back to the range of all data
+    l.set_xdata(np.random.default_rng(0).permutation(x))
+    assert np.allclose(line_yrange(l, 2, 3), (-10, 0))
+    plt.close(fig)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from markerplot.spatial import DisplayGrid
+
+def brute_nearest(xy, x, y):
+    dist = np.abs(xy[:,0] - x) + np.abs(xy[:,1] - y)
+    return np.nanmin(dist)
+
+def check_grid(xy, queries):
+    grid = DisplayGrid(xy)
+    for x, y in queries:
+        idx, dist = grid.nearest(x, y)
+        ## ties may return any of the nearest points, so compare distances
+        assert dist == brute_nearest(xy, x, y)
+        assert abs(xy[idx,0] - x) + abs(xy[idx,1] - y) == dist
+
+def test_nearest_uniform():
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 800, (20000, 2))
+    queries = rng.uniform(-100, 900, (200, 2))
+    check_grid(xy, queries)
+
+def test_nearest_clustered():
+    rng = np.random.default_rng(1)
+    ## a dense cluster and a few outliers give mostly empty cells
+    xy = np.concatenate((rng.normal(100, 2, (10000, 2)), rng.uniform(0, 1000, (20, 2))))
+    queries = rng.uniform(0, 1000, (200, 2))
+    check_grid(xy, queries)
+
+def test_nearest_line_with_nan():
+    x = np.linspace(0, 600, 5000)
+    xy = np.column_stack((x, 200 + 100*np.sin(x/20)))
+    xy[::7] = np.nan
+    rng = np.random.default_rng(2)
+    check_grid(xy, rng.uniform(-50, 650, (200, 2)))
+
+def test_nearest_small_line_is_scanned():
+    rng = np.random.default_rng(3)
+    xy = rng.uniform(0, 100, (DisplayGrid.min_points - 1, 2))
+    assert DisplayGrid(xy).scan
+    check_grid(xy, rng.uniform(0, 100, (50, 2)))
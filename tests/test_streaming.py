@@ -0,0 +1,46 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+import markerplot
+from markerplot.streaming import RingBuffer
+
+def test_ringbuffer_matches_list():
+    rng = np.random.default_rng(0)
+    for capacity in (1, 2, 7, 100):
+        buf = RingBuffer(capacity)
+        ref = []
+        for step in range(200):
+            values = rng.normal(size=rng.integers(0, 2*capacity + 3))
+            dropped = buf.append(values)
+
+            ref += list(values)
+            expected_dropped = max(len(ref) - capacity, 0)
+            ref = ref[-capacity:]
+
+            assert dropped == expected_dropped
+            assert len(buf) == len(ref)
+            assert np.array_equal(buf.view(), ref)
+
+def test_ringbuffer_view_is_contiguous():
+    buf = RingBuffer(5)
+    buf.append(np.arange(12))
+    view = buf.view()
+    assert view.flags['C_CONTIGUOUS']
+    assert np.shares_memory(view, buf._data)
+    assert np.array_equal(view, np.arange(7, 12))
+
+def test_stream_refresh_keeps_lowest_rate():
+    fig, (ax1, ax2) = plt.subplots(2, 1)
+    l1, = ax1.plot(np.arange(10.0))
+    l2, = ax2.plot(np.arange(10.0))
+    fig.marker_enable(interactive=False)
+
+    s1 = ax1.marker_stream(l1, 100, max_fps=10)
+    s2 = ax2.marker_stream(l2, 100, max_fps=60)
+    assert s1.refresh is s2.refresh
+    assert s1.refresh.max_fps == 10
+
+    l3, = ax2.plot(np.arange(10.0))
+    ax2.marker_stream(l3, 100, max_fps=None)
+    assert s1.refresh.max_fps == 10
+    plt.close(fig)